@@ -5,7 +5,9 @@ Special Thanks: Eric Snow for his work on subinterpreters and a per-interpreter
 """
 
 import atexit
+import pickle
 import sys
+import time
 import weakref
 from textwrap import dedent as D
 
@@ -29,6 +31,8 @@ except ImportError:
         )
 
 
+from . import _memoryboard
+
 # Early declarations to avoid circular imports:
 
 __version__ = "0.2.0"
@@ -47,9 +51,17 @@ RootInterpProxy = RootInterpProxy()
 
 running_interpreters[0] = RootInterpProxy
 
+_current_interp = None
+
+
 def get_current():
-    id_ = interpreters.get_current()
-    return int(id_) if not isinstance(id_, tuple) else id_[0]
+    # Each interpreter imports its own copy of this module, so
+    # the id can be cached in a module global.
+    global _current_interp
+    if _current_interp is None:
+        id_ = interpreters.get_current()
+        _current_interp = int(id_) if not isinstance(id_, tuple) else id_[0]
+    return _current_interp
 
 
 def raw_list_all():
@@ -59,6 +71,32 @@ def raw_list_all():
         return ids
     return [tuple_id[0] for tuple_id in interpreters.list_all()]
 
+
+_interp_set_cache = (0.0, -1, frozenset())
+
+
+def cached_interp_set(ttl=0.1):
+    """Set of live interpreter ids, refreshed at most once every "ttl" seconds
+
+    Interpreters started or closed by extrainterpreters, in any interpreter,
+    invalidate the cache at once. Others, created with the low level
+    module, only show up after it expires: call with ttl=0 to force a refresh.
+    """
+    global _interp_set_cache
+    now = time.monotonic()
+    timestamp, generation, ids = _interp_set_cache
+    current = _memoryboard._interp_generation()
+    if now - timestamp > ttl or generation != current:
+        ids = frozenset(int(id_) for id_ in raw_list_all())
+        _interp_set_cache = (now, current, ids)
+    return ids
+
+
+def _invalidate_interp_set():
+    # Reaches the caches in all interpreters, not only in this one
+    _memoryboard._bump_interp_generation()
+
+
 if not hasattr(interpreters, "RunFailedError"):
     # exception was removed in Python 3.13, but we need to
     # have it present in some except clauses while  3.12 is supported:
@@ -102,3 +140,8 @@ def destroy_dangling_interpreters():
 # the new "if __name__ == "__main__":
 if interpreters.get_current() == interpreters.get_main():
     atexit.register(destroy_dangling_interpreters)
+    # On (at least) Python 3.12.1, the first "pickle.loads" call passing
+    # "buffers" caches objects that outlive the interpreter making it:
+    # if that is a subinterpreter, the process crashes at exit.
+    # Queues pass "buffers" from subinterpreters, so make that first call here.
+    pickle.loads(pickle.dumps(None), buffers=[])
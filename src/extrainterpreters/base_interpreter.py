@@ -7,7 +7,7 @@ from types import ModuleType, FunctionType
 from textwrap import dedent as D
 
 
-from . import interpreters, BFSZ, running_interpreters
+from . import interpreters, BFSZ, running_interpreters, _invalidate_interp_set
 
 
 _TTL = sys.getswitchinterval() * 10
@@ -25,6 +25,7 @@ class BaseInterpreter:
                 raise RuntimeError("Interpreter already started")
             self.intno = self.id = interpreters.create()
             running_interpreters[self.intno] = self
+            _invalidate_interp_set()
             self.thread = None
             self._create_channel()
             self._init_interpreter()
@@ -51,6 +52,7 @@ class BaseInterpreter:
                     # leave the sub-interpreter on this state.
                     return
                 interpreters.destroy(self.intno)
+                _invalidate_interp_set()
             except RuntimeError:
                 raise  ## raised if interpreter is running. TBD: add a timeout mechanism
             self.intno = None
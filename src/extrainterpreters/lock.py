@@ -8,7 +8,8 @@ from . import running_interpreters
 from .remote_array import RemoteArray
 from .utils import (
     _atomic_byte_lock,
-    _remote_memory,
+    _atomic_byte_lock_timed,
+    _atomic_byte_unlock,
     _address_and_size,
     guard_internal_use,
     Field,
@@ -23,6 +24,13 @@ TIME_RESOLUTION = sys.getswitchinterval()
 DEFAULT_TIMEOUT = 50 * TIME_RESOLUTION
 DEFAULT_TTL = 3600
 LOCK_BUFFER_SIZE = _LockBuffer._size
+# Waiting for a contended lock takes place in native code:
+# busy-spin rounds doubling up to SPIN_BUDGET pauses, then the thread is
+# parked on a futex where available - otherwise it sleeps, with
+# intervals growing up to the former polling interval.
+SPIN_BUDGET = 64
+MIN_SLEEP_NS = 1_000
+MAX_SLEEP_NS = int(TIME_RESOLUTION * 4 * 1e9)
 
 
 class _CrossInterpreterStructLock:
@@ -50,7 +58,7 @@ class _CrossInterpreterStructLock:
         else:  # bytes, bytearray
             buffer_ptr, size = _address_and_size(struct._data)  # , struct._offset)
         # struct_ptr = buffer_ptr + struct._offset
-        lock_offset = struct._offset + struct._get_offset_for_field("lock")
+        lock_offset = struct._offset + type(struct).lock.offset
         if lock_offset >= size:
             raise ValueError("Lock address out of bounds for struct buffer")
         self._lock_address = buffer_ptr + lock_offset
@@ -80,14 +88,10 @@ class _CrossInterpreterStructLock:
         if timeout is None or timeout == 0:
             if not _atomic_byte_lock(self._lock_address):
                 raise ResourceBusyError("Couldn't acquire lock")
-        else:
-            threshold = time.monotonic() + timeout
-            while time.monotonic() <= threshold:
-                if _atomic_byte_lock(self._lock_address):
-                    break
-                time.sleep(TIME_RESOLUTION * 4)
-            else:
-                raise TimeoutError("Timeout trying to acquire lock")
+        elif not _atomic_byte_lock_timed(
+            self._lock_address, timeout, SPIN_BUDGET, MIN_SLEEP_NS, MAX_SLEEP_NS
+        ):
+            raise TimeoutError("Timeout trying to acquire lock")
         self._entered += 1
         return self
 
@@ -100,9 +104,7 @@ class _CrossInterpreterStructLock:
         self._entered -= 1
         if self._entered:
             return
-        buffer = _remote_memory(self._lock_address, 1)
-        buffer[0] = 0
-        del buffer
+        _atomic_byte_unlock(self._lock_address)
         self._entered = 0
         self._timeout = self._original_timeout
 
@@ -199,29 +201,23 @@ class Lock(IntRLock):
     _delay = 4 * TIME_RESOLUTION
 
     def acquire(self, blocking=True, timeout=-1):
-        locked = self.locked()
-        if self.locked() and not blocking:
-            return False
-        timeout = TIMEOUT_MAX if timeout == -1 else timeout
-        start = time.monotonic()
-        retry = False
-        while time.monotonic() - start < timeout:
-            if self.locked():
-                retry = True
+        # A single attempt on the cross-interpreter lock per iteration:
+        # if it was already held by this interpreter (re-entering it),
+        # the extra entry is undone and we wait like any other contender.
+        deadline = None
+        while True:
+            try:
+                self._lock.acquire(0)
+            except ResourceBusyError:
+                pass
             else:
-                try:
-                    self._lock.acquire(0)
-                except ResourceBusyError:
-                    retry = True
-
-                if self._lock._entered > 1:
-                    retry = True
-                    self._lock.release()
-
-            if not retry:
-                return True
-
+                if self._lock._entered == 1:
+                    return True
+                self._lock.release()
+            if not blocking:
+                return False
+            if deadline is None:
+                deadline = time.monotonic() + (TIMEOUT_MAX if timeout == -1 else timeout)
+            if time.monotonic() >= deadline:
+                raise ResourceBusyError("Could not acquire lock")
             time.sleep(self._delay)
-            retry = False
-
-        raise ResourceBusyError("Could not acquire lock")
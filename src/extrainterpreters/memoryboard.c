@@ -1,5 +1,111 @@
 #include <Python.h>
 #include <stdatomic.h>
+#include <stdint.h>
+#include <string.h>
+
+#include <errno.h>
+
+#ifdef _WIN32
+#include <windows.h>
+#include <io.h>
+#define READ_FD(fd, target, count) _read((fd), (target), (unsigned int)(count))
+#else
+#include <time.h>
+#include <unistd.h>
+#define READ_FD(fd, target, count) read((fd), (target), (count))
+#endif
+
+#ifdef __linux__
+#include <limits.h>
+#include <linux/futex.h>
+#include <sys/syscall.h>
+#include <unistd.h>
+#define HAVE_FUTEX 1
+#endif
+
+#if defined(__x86_64__) || defined(__i386__)
+#define CPU_RELAX() __builtin_ia32_pause()
+#elif defined(__aarch64__) || defined(__arm__)
+#define CPU_RELAX() __asm__ __volatile__("yield")
+#else
+#define CPU_RELAX() ((void)0)
+#endif
+
+/* Lock byte values: 0 is free, 1 is locked, and LOCKED_CONTENDED
+   is locked with (possibly) parked waiters, which must be woken on release. */
+#define LOCKED_CONTENDED 2
+
+static inline int
+_try_lock_byte(atomic_char *target)
+{
+    char expected = 0;
+    return atomic_compare_exchange_strong(target, &expected, 1);
+}
+
+static double
+_monotonic(void)
+{
+#ifdef _WIN32
+    return GetTickCount64() / 1000.0;
+#else
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return ts.tv_sec + ts.tv_nsec * 1e-9;
+#endif
+}
+
+#ifndef HAVE_FUTEX
+static void
+_sleep_ns(long long ns)
+{
+#ifdef _WIN32
+    Sleep((DWORD)(ns / 1000000));
+#else
+    struct timespec ts = {ns / 1000000000, ns % 1000000000};
+    nanosleep(&ts, NULL);
+#endif
+}
+#endif
+
+/* Futexes work on aligned 32 bit words: lock bytes are waited on
+   through the word containing them. Neighbour bytes changing will
+   cause spurious wake ups, which callers handle by re-checking. */
+#ifdef HAVE_FUTEX
+static inline uint32_t *
+_futex_word(atomic_char *target)
+{
+    return (uint32_t *)((uintptr_t)target & ~(uintptr_t)3);
+}
+#endif
+
+/* Parks the calling thread while the byte at `target` holds `value`,
+   for at most `timeout_ns`. Where there are no futexes, just sleeps. */
+static void
+_wait_on_byte(atomic_char *target, char value, long long timeout_ns)
+{
+#ifdef HAVE_FUTEX
+    uint32_t *word_ptr = _futex_word(target);
+    uint32_t word = atomic_load((_Atomic uint32_t *)word_ptr);
+    struct timespec ts = {timeout_ns / 1000000000, timeout_ns % 1000000000};
+
+    if (((char *)&word)[(uintptr_t)target & 3] != value) {
+        return;
+    }
+    syscall(SYS_futex, word_ptr, FUTEX_WAIT_PRIVATE, word, &ts, NULL, 0);
+#else
+    _sleep_ns(timeout_ns);
+#endif
+}
+
+static void
+_wake_byte_waiters(atomic_char *target)
+{
+#ifdef HAVE_FUTEX
+    /* Waiters for other bytes in the same word could take a single
+       wake up, so all are woken */
+    syscall(SYS_futex, _futex_word(target), FUTEX_WAKE_PRIVATE, INT_MAX, NULL, NULL, 0);
+#endif
+}
 
 PyDoc_STRVAR(_memoryboard_remote_memory_doc,
 "remote_memory(buffer_address, buffer_length)\n\
@@ -61,7 +167,7 @@ static PyObject *_memoryboard_get_address_and_size(PyObject *self, PyObject *arg
 }
 
 PyDoc_STRVAR(_atomic_byte_loc_doc,
-"_atomic_byte_loc(byte_address) -> bool\n\
+"_atomic_byte_loc(byte_address, spins=0) -> bool\n\
 \n\
 Returns true if the byte at given address is incread from 0 to 1\n\n\
 \
@@ -70,26 +176,443 @@ or ctypes) is successfully atomically found to be zero, and increased to one \
 using standard C functionality for atomic data.\n\n\
 \
 This call can be used to build absolute locks accross\n\
-interpreters and threads in pure Python.\n\
+interpreters and threads in pure Python.\n\n\
+\
+A byte found to be non-zero is not written to.\n\n\
+\
+If `spins` is given, a byte found taken is checked again up to `spins` \
+times, with a CPU pause instruction in between, before giving up. \
+This is meant for locks held only for a few instructions: \
+the GIL is kept, as releasing it would cost more than the wait.\n\
 ");
 
 static PyObject *_atomic_byte_loc(PyObject *self, PyObject *args)
 {
     Py_ssize_t address;
     atomic_char *target;
+    int spins = 0;
+
+    if (!PyArg_ParseTuple(args, "n|i", &address, &spins)) {
+        return NULL;
+    }
+
+    target = (atomic_char *) address;
+    for (int i = 0; ; i++) {
+        /* A relaxed load first: a byte found taken is left alone, with no
+           locked read-modify-write on its cache line. This is only a
+           shortcut - the compare-and-swap alone decides who gets the lock. */
+        if (atomic_load_explicit(target, memory_order_relaxed) == 0 && _try_lock_byte(target)) {
+            Py_RETURN_TRUE;
+        }
+        if (i >= spins) {
+            break;
+        }
+        CPU_RELAX();
+    }
+
+    Py_RETURN_FALSE;
+}
+
+PyDoc_STRVAR(_atomic_byte_unlock_doc,
+"_atomic_byte_unlock(byte_address)\n\
+\n\
+Sets the byte at the given address to 0 with release semantics: \
+any writes made before this call are visible to whoever acquires \
+the byte next with `_atomic_byte_lock`.\n\n\
+\
+Threads parked in `_atomic_byte_lock_timed` waiting for \
+this byte are woken up.\n\
+");
+
+static PyObject *_atomic_byte_unlock(PyObject *self, PyObject *args)
+{
+    Py_ssize_t address;
 
     if (!PyArg_ParseTuple(args, "n", &address)) {
         return NULL;
     }
 
+    if (atomic_exchange_explicit((atomic_char *) address, 0, memory_order_release) == LOCKED_CONTENDED) {
+        _wake_byte_waiters((atomic_char *) address);
+    }
+    Py_RETURN_NONE;
+}
+
+PyDoc_STRVAR(_atomic_add_u32_doc,
+"_atomic_add_u32(address, delta) -> int\n\
+\n\
+Atomically adds `delta` to the 4 byte aligned unsigned integer \
+at the given address, and returns its previous value.\n\
+Unlike a lock, this can't fail nor block.\n\
+");
+
+static PyObject *_atomic_add_u32(PyObject *self, PyObject *args)
+{
+    Py_ssize_t address;
+    unsigned int delta;
+
+    if (!PyArg_ParseTuple(args, "nI", &address, &delta)) {
+        return NULL;
+    }
+
+    return PyLong_FromUnsignedLong(
+        atomic_fetch_add((_Atomic uint32_t *) address, (uint32_t) delta)
+    );
+}
+
+/* Static data is shared by every interpreter in the process,
+   unlike the module objects, which each interpreter creates anew. */
+static atomic_size_t interp_generation = 0;
+
+PyDoc_STRVAR(_interp_generation_doc,
+"_interp_generation() -> int\n\
+\n\
+Process-wide count of changes to the set of live interpreters, \
+as posted with `_bump_interp_generation`. Caches of that set \
+are stale whenever this changes.\n\
+");
+
+static PyObject *_interp_generation(PyObject *self, PyObject *Py_UNUSED(args))
+{
+    return PyLong_FromSize_t(atomic_load(&interp_generation));
+}
+
+PyDoc_STRVAR(_bump_interp_generation_doc,
+"_bump_interp_generation() -> None\n\
+\n\
+Marks every cache of live interpreters, in all interpreters, as stale.\n\
+");
+
+static PyObject *_bump_interp_generation(PyObject *self, PyObject *Py_UNUSED(args))
+{
+    atomic_fetch_add(&interp_generation, 1);
+    Py_RETURN_NONE;
+}
+
+PyDoc_STRVAR(_fill_from_fd_doc,
+"_fill_from_fd(fd, buffer) -> int\n\
+\n\
+Reads from `fd` into the writable `buffer` until it is full, \
+the other end is closed, or no more data is available \
+on a non-blocking fd. Returns the number of bytes read.\n\
+The GIL is released while reading.\n\n\
+\
+As with `os.readv`, BlockingIOError is raised if nothing could \
+be read from a non-blocking fd.\n\
+");
+
+static PyObject *_fill_from_fd(PyObject *self, PyObject *args)
+{
+    int fd;
+    Py_buffer buffer;
+    Py_ssize_t position = 0, count = 0;
+    int error = 0;
+
+    if (!PyArg_ParseTuple(args, "iw*", &fd, &buffer)) {
+        return NULL;
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    while (position < buffer.len) {
+        count = READ_FD(fd, (char *)buffer.buf + position, buffer.len - position);
+        if (count > 0) {
+            position += count;
+            continue;
+        }
+        if (count < 0) {
+            if (errno == EINTR) {
+                continue;
+            }
+            error = errno;
+        }
+        break;
+    }
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&buffer);
+    if (error && (position == 0 || (error != EAGAIN && error != EWOULDBLOCK))) {
+        errno = error;
+        return PyErr_SetFromErrno(PyExc_OSError);
+    }
+    return PyLong_FromSsize_t(position);
+}
+
+PyDoc_STRVAR(_atomic_byte_lock_timed_doc,
+"_atomic_byte_lock_timed(byte_address, timeout, spin_budget, min_sleep_ns, max_sleep_ns) -> bool\n\
+\n\
+Tries to atomically change the byte at the given address from 0 to non-zero, \
+retrying until `timeout` seconds have passed.\n\n\
+\
+Busy-waits first, with CPU pause instructions in rounds doubling \
+in length up to `spin_budget`. Then the thread is parked: on Linux, \
+with a futex, woken by `_atomic_byte_unlock` and re-checking at least every \
+`max_sleep_ns`; elsewhere, sleeping from `min_sleep_ns` up to \
+`max_sleep_ns` nanoseconds, doubling each time. \
+The GIL is released while waiting.\n\n\
+\
+Returns True if the lock was acquired, False on timeout.\n\
+");
+
+static PyObject *_atomic_byte_lock_timed(PyObject *self, PyObject *args)
+{
+    Py_ssize_t address;
+    double timeout, deadline, remaining;
+    int spin_budget, acquired = 0;
+    long long sleep_ns, max_sleep_ns;
+    atomic_char *target;
+
+    if (!PyArg_ParseTuple(args, "ndiLL", &address, &timeout, &spin_budget, &sleep_ns, &max_sleep_ns)) {
+        return NULL;
+    }
+
     target = (atomic_char *) address;
-    if (*target == 0 && (++*target) == 1) {
+    if (_try_lock_byte(target)) {
         Py_RETURN_TRUE;
     }
 
+    Py_BEGIN_ALLOW_THREADS
+    deadline = _monotonic() + timeout;
+    for (int spins = 1; spins <= spin_budget && !acquired; spins *= 2) {
+        for (int i = 0; i < spins; i++) {
+            CPU_RELAX();
+        }
+        acquired = atomic_load_explicit(target, memory_order_relaxed) == 0 && _try_lock_byte(target);
+    }
+    while (!acquired) {
+        /* Flag the lock as contended, so that its release wakes us up.
+           Finding it free at this point means we hold it - and as
+           other threads may be parked, it is kept flagged. */
+        if (atomic_exchange(target, LOCKED_CONTENDED) == 0) {
+            acquired = 1;
+            break;
+        }
+        remaining = deadline - _monotonic();
+        if (remaining <= 0) {
+            break;
+        }
+#ifdef HAVE_FUTEX
+        sleep_ns = max_sleep_ns;
+#endif
+        if (remaining * 1e9 < sleep_ns) {
+            sleep_ns = (long long)(remaining * 1e9) + 1;
+        }
+        _wait_on_byte(target, LOCKED_CONTENDED, sleep_ns);
+        if (sleep_ns < max_sleep_ns) {
+            sleep_ns = sleep_ns * 2 < max_sleep_ns ? sleep_ns * 2 : max_sleep_ns;
+        }
+    }
+    Py_END_ALLOW_THREADS
+
+    if (acquired) {
+        Py_RETURN_TRUE;
+    }
     Py_RETURN_FALSE;
 }
 
+static inline int
+_state_in_mask(atomic_char *block, unsigned long state_mask, memory_order order)
+{
+    unsigned char state = (unsigned char)atomic_load_explicit(block, order);
+    return state < 32 && (state_mask >> state) & 1;
+}
+
+/* SWAR ("SIMD within a register") helpers: when states are stored in
+   a dense column (stride 1), 8 of them are tested at once in a 64 bit
+   word. Results have the high bit set in each matching byte. */
+#define SWAR_ONES 0x0101010101010101ULL
+#define SWAR_LOW7 0x7F7F7F7F7F7F7F7FULL
+
+static inline uint64_t
+_load_word(char *address)
+{
+    /* A plain load: the words are only used as a hint, and every
+       candidate byte is checked again with atomic operations. */
+    uint64_t word;
+    memcpy(&word, address, sizeof(word));
+    return word;
+}
+
+static inline uint64_t
+_zero_bytes(uint64_t word)
+{
+    /* exact: no carries across bytes, unlike the shorter
+       (word - SWAR_ONES) & ~word & ~SWAR_LOW7 */
+    return ~(((word & SWAR_LOW7) + SWAR_LOW7) | word | SWAR_LOW7);
+}
+
+static inline uint64_t
+_bytes_in_mask(uint64_t word, unsigned long state_mask)
+{
+    uint64_t result = 0;
+
+    for (int state = 0; state < 32 && state_mask >> state; state++) {
+        if ((state_mask >> state) & 1) {
+            result |= _zero_bytes(word ^ (SWAR_ONES * state));
+        }
+    }
+    return result;
+}
+
+static inline Py_ssize_t
+_count_high_bits(uint64_t bytes)
+{
+    /* sums the bytes, each 0 or 1 after the shift, into the top byte */
+    return (Py_ssize_t)((((bytes >> 7) * SWAR_ONES) >> 56));
+}
+
+/* Locks the record with the state byte at `state`, if the state is in
+   `state_mask`, rechecking it after the lock is taken. Returns true
+   if the record is now locked by the caller. */
+static inline int
+_lock_block_in_mask(atomic_char *state, unsigned long state_mask, Py_ssize_t lock_offset)
+{
+    atomic_char *lock = state + lock_offset;
+
+    if (!_state_in_mask(state, state_mask, memory_order_relaxed)
+            || atomic_load_explicit(lock, memory_order_relaxed) != 0
+            || !_try_lock_byte(lock)) {
+        return 0;
+    }
+    if (_state_in_mask(state, state_mask, memory_order_acquire)) {
+        return 1;
+    }
+    atomic_store_explicit(lock, 0, memory_order_release);
+    return 0;
+}
+
+PyDoc_STRVAR(_find_and_lock_block_doc,
+"_find_and_lock_block(address, nblocks, stride, start, state_mask, lock_offset) -> int\n\
+\n\
+Scans the state bytes of `nblocks` records, `stride` bytes apart, \
+starting at `address`. The lock byte of each record is `lock_offset` \
+bytes after its state byte.\n\n\
+\
+Locks and returns the index of the first record at or after `start` \
+whose state bit is set in `state_mask` - or returns -1 if there \
+is none. The state is checked again once the lock byte is acquired: \
+records which changed state in between are released and skipped.\n\n\
+\
+With `stride` 1, 8 states and locks are tested at a time.\n\
+");
+
+static PyObject *_find_and_lock_block(PyObject *self, PyObject *args)
+{
+    Py_ssize_t address, nblocks, stride, start, lock_offset, end;
+    unsigned long state_mask;
+
+    if (!PyArg_ParseTuple(args, "nnnnkn", &address, &nblocks, &stride, &start, &state_mask, &lock_offset)) {
+        return NULL;
+    }
+
+    for (Py_ssize_t i = start; i < nblocks;) {
+        end = i + 1;
+        if (stride == 1 && nblocks - i >= 8) {
+            char *states = (char *)(address + i);
+            uint64_t candidates = _bytes_in_mask(_load_word(states), state_mask)
+                    & _zero_bytes(_load_word(states + lock_offset));
+            unsigned char flags[8];
+
+            if (!candidates) {
+                i += 8;
+                continue;
+            }
+            /* back to memory order, so that flags[j] matches record i + j
+               regardless of endianness: only flagged records are tried. */
+            memcpy(flags, &candidates, 8);
+            for (int j = 0; j < 8; j++) {
+                if ((flags[j] & 0x80)
+                        && _lock_block_in_mask((atomic_char *)(states + j), state_mask, lock_offset)) {
+                    return PyLong_FromSsize_t(i + j);
+                }
+            }
+            i += 8;
+            continue;
+        }
+        for (; i < end; i++) {
+            if (_lock_block_in_mask((atomic_char *)(address + i * stride), state_mask, lock_offset)) {
+                return PyLong_FromSsize_t(i);
+            }
+        }
+    }
+    return PyLong_FromSsize_t(-1);
+}
+
+PyDoc_STRVAR(_reset_blocks_doc,
+"_reset_blocks(address, nblocks, stride, state_mask, lock_offset) -> list\n\
+\n\
+Sets the state of all records whose state bit is set in `state_mask` \
+to 0, each while holding its lock byte, in the layout used by \
+`_find_and_lock_block`. Records whose lock is taken are skipped.\n\n\
+\
+Returns the indexes of the records that were reset.\n\
+");
+
+static PyObject *_reset_blocks(PyObject *self, PyObject *args)
+{
+    Py_ssize_t address, nblocks, stride, lock_offset;
+    unsigned long state_mask;
+    atomic_char *state;
+    PyObject *result, *index;
+
+    if (!PyArg_ParseTuple(args, "nnnkn", &address, &nblocks, &stride, &state_mask, &lock_offset)) {
+        return NULL;
+    }
+
+    result = PyList_New(0);
+    if (result == NULL) {
+        return NULL;
+    }
+    for (Py_ssize_t i = 0; i < nblocks; i++) {
+        if (stride == 1 && i % 8 == 0 && nblocks - i >= 8
+                && !_bytes_in_mask(_load_word((char *)(address + i)), state_mask)) {
+            i += 7;
+            continue;
+        }
+        state = (atomic_char *)(address + i * stride);
+        if (!_lock_block_in_mask(state, state_mask, lock_offset)) {
+            continue;
+        }
+        atomic_store_explicit(state, 0, memory_order_relaxed);
+        atomic_store_explicit(state + lock_offset, 0, memory_order_release);
+        index = PyLong_FromSsize_t(i);
+        if (index == NULL || PyList_Append(result, index) < 0) {
+            Py_XDECREF(index);
+            Py_DECREF(result);
+            return NULL;
+        }
+        Py_DECREF(index);
+    }
+    return result;
+}
+
+PyDoc_STRVAR(_count_blocks_doc,
+"_count_blocks(address, nblocks, stride, state_mask) -> int\n\
+\n\
+Counts the records, in the same layout used by `_find_and_lock_block`, \
+whose state bit is set in `state_mask`, regardless of their lock byte.\n\
+");
+
+static PyObject *_count_blocks(PyObject *self, PyObject *args)
+{
+    Py_ssize_t address, nblocks, stride, count = 0;
+    unsigned long state_mask;
+
+    if (!PyArg_ParseTuple(args, "nnnk", &address, &nblocks, &stride, &state_mask)) {
+        return NULL;
+    }
+
+    Py_ssize_t i = 0;
+    if (stride == 1) {
+        for (; nblocks - i >= 8; i += 8) {
+            count += _count_high_bits(_bytes_in_mask(_load_word((char *)(address + i)), state_mask));
+        }
+    }
+    for (; i < nblocks; i++) {
+        count += _state_in_mask((atomic_char *)(address + i * stride), state_mask, memory_order_relaxed);
+    }
+    return PyLong_FromSsize_t(count);
+}
+
 static PyObject *_object_from_id(PyObject *self, PyObject *args)
 {
     Py_ssize_t address;
@@ -109,6 +632,15 @@ static PyMethodDef _memoryboard_methods[] = {
     {"_remote_memory", _memoryboard_remote_memory, METH_VARARGS, _memoryboard_remote_memory_doc},
     {"_address_and_size", _memoryboard_get_address_and_size, METH_VARARGS, _memoryboard_get_address_and_size_doc},
     {"_atomic_byte_lock", _atomic_byte_loc, METH_VARARGS, _atomic_byte_loc_doc},
+    {"_atomic_byte_unlock", _atomic_byte_unlock, METH_VARARGS, _atomic_byte_unlock_doc},
+    {"_atomic_add_u32", _atomic_add_u32, METH_VARARGS, _atomic_add_u32_doc},
+    {"_fill_from_fd", _fill_from_fd, METH_VARARGS, _fill_from_fd_doc},
+    {"_interp_generation", _interp_generation, METH_NOARGS, _interp_generation_doc},
+    {"_bump_interp_generation", _bump_interp_generation, METH_NOARGS, _bump_interp_generation_doc},
+    {"_atomic_byte_lock_timed", _atomic_byte_lock_timed, METH_VARARGS, _atomic_byte_lock_timed_doc},
+    {"_find_and_lock_block", _find_and_lock_block, METH_VARARGS, _find_and_lock_block_doc},
+    {"_reset_blocks", _reset_blocks, METH_VARARGS, _reset_blocks_doc},
+    {"_count_blocks", _count_blocks, METH_VARARGS, _count_blocks_doc},
     {"_object_from_id", _object_from_id, METH_VARARGS, "Swift death. Do not use."},
     {NULL, NULL, 0, NULL}
 };
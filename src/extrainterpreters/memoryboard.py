@@ -1,22 +1,26 @@
 import os
 import pickle
+import struct
 import threading
 import time
 import sys
 from functools import wraps
+from itertools import pairwise
 
 from collections.abc import MutableSequence
 
-from . import interpreters, running_interpreters, get_current, raw_list_all
+from . import interpreters, running_interpreters, get_current, cached_interp_set
 from . import _memoryboard
 from .remote_array import RemoteArray
 from .utils import (
     _InstMode,
+    # guarded low level functions, available from this module as well:
     _remote_memory,
     _address_and_size,
     _atomic_byte_lock,
     DoubleField,
     Field,
+    RawField,
     StructBase,
     ResourceBusyError,
     guard_internal_use
@@ -24,6 +28,10 @@ from .utils import (
 
 from .lock import _CrossInterpreterStructLock
 
+# Board methods and helpers below call native functions straight from
+# "_memoryboard": the caller check in "guard_internal_use" inspects a frame
+# on every call, and these calls are always made from within this module.
+
 
 DEFAULT_TTL = 3600
 
@@ -57,18 +65,18 @@ class ProcessBuffer(BufferBase):
         self.map.__enter__()
 
     def _init_range_sizes(self):
-        prev_range = ""
-        last_range_start = 0
+        starts = list(self.nranges.items())
         self.range_sizes = {}
-        for i, (range_name, offset) in enumerate(self.nranges.items()):
-            if i:
-                self.range_sizes[prev_range] = offset - self.nranges[prev_range]
-            prev_range = range_name
-            if offset < last_range_start:
+        for (range_name, offset), (_, next_offset) in pairwise(starts):
+            if next_offset < offset:
                 raise ValueError(
                     "Buffer Range window starts must be in ascending order"
                 )
-            last_range_start = offset
+            self.range_sizes[range_name] = next_offset - offset
+        if starts:
+            # the last range goes up to the end of the buffer
+            range_name, offset = starts[-1]
+            self.range_sizes[range_name] = self.size - offset
 
     def __repr__(self):
         return f"<interprocess buffer with {self.size:_} bytes>"
@@ -88,13 +96,96 @@ class State:
     garbage = 5
 
 
+# bitmasks of states, as used by the native block scanners:
+FREE_STATES = 1 << State.not_initialized | 1 << State.garbage
+GARBAGE_STATES = 1 << State.garbage
+READY_STATES = 1 << State.ready
+EMPTY_STATES = 1 << State.not_initialized
+_FREE_STATE_VALUES = frozenset((State.not_initialized, State.garbage))
+
+# Number of disjoint ranges each board is split into for allocation;
+# boards are never split in ranges of less than one cache line of states.
+BOARD_SHARDS = 16
+
+# Payload buffers kept for reuse, per size class, in each board:
+MIN_POOLED_SIZE = 256
+POOL_DEPTH = 64
+
+
+class ContentType:
+    pickled = 0
+    # pickle protocol 5 payload, prefixed with a table
+    # of addresses for its out-of-band buffers:
+    pickled_oob = 1
+    # plain values, stored without going through pickle:
+    int64 = 2
+    float64 = 3
+    raw_bytes = 4
+    text = 5
+    none = 6
+    boolean = 7
+    raw_bytearray = 8
+    # contiguous memoryviews: format and shape, followed by the raw bytes
+    raw_memoryview = 9
+
+
+CACHE_LINE = 64
+INLINE_SIZE = 32
+
+# Block locks are held only while a few fields are read or written:
+# callers that must not fail retry this many times before giving up.
+BLOCK_LOCK_SPINS = 16
+
+
+class _Column:
+    """A one byte per block field, stored in its own contiguous board column"""
+
+    def __init__(self, column):
+        self.column = column
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance._data[instance._nblocks * self.column + instance._index]
+
+    def __set__(self, instance, value):
+        instance._data[instance._nblocks * self.column + instance._index] = value
+
+
 class BlockLock(StructBase):
-    state = Field(1)  # State
-    lock = Field(1)  # LockState
-    owner = Field(4)  # InterpreterID(threadID?)
-    content_type = Field(1)  # 0 for pickled data
+    """Control data for one block in a LockableBoard
+
+    The board is laid out as columns: the state bytes of all blocks,
+    then their lock bytes, and then, starting at a cache line boundary,
+    their metadata records (the fields declared here). Scans of the board
+    only ever touch the state column - a single cache line holds the
+    states of 64 blocks.
+
+    Payloads of up to INLINE_SIZE bytes are stored in the record itself,
+    in "inline_data", and have a "content_address" of 0.
+    """
+
+    state = _Column(0)  # State
+    lock = _Column(1)  # LockState
+
     content_address = Field(8)
     content_length = Field(8)
+    owner = Field(4)  # InterpreterID(threadID?)
+    content_type = Field(1)  # ContentType
+    inline_data = RawField(INLINE_SIZE)
+    # pads the struct to a full cache line, so that writing a block
+    # metadata does not invalidate the line of its neighbours'.
+    _pad = RawField(11)
+
+    @classmethod
+    def _from_board(cls, data, nblocks, index, meta_offset):
+        self = cls._from_data(data, meta_offset + index * cls._size)
+        self._nblocks = nblocks
+        self._index = index
+        return self
 
 
 class LockableBoard:
@@ -102,9 +193,21 @@ class LockableBoard:
 
     def __init__(self, size=None):
         self._size = size or self.maxblocks
-        self.map = RemoteArray(size=self._size * BlockLock._size)
+        columns_size = 2 * self._size
+        self.map = RemoteArray(
+            size=columns_size + CACHE_LINE + self._size * BlockLock._size
+        )
         self.map.start()
+        self._address = self.map._data_for_remote()[0]
+        self._locks_address = self._address + self._size
+        self._view = self.map._payload_view()
+        # The buffer is not allocated at a cache line boundary: the
+        # metadata column is moved ahead to the next one. (Offsets are
+        # the same in all interpreters, as they share the memory itself)
+        self._meta_offset = columns_size + -(self._address + columns_size) % CACHE_LINE
         self.blocks = {}
+        self._init_free_blocks()
+        self._payload_pool = {}
         self._parent_interp = get_current()
         # This is incremented when a item that "looks good"
         # was originally exported by a interpreter that is closed now.
@@ -123,13 +226,43 @@ class LockableBoard:
     def __getstate__(self):
         ns = self.__dict__.copy()
         del ns["blocks"]
+        del ns["_free_blocks"]
+        del ns["_free_lock"]
+        del ns["_free_hint"]
+        del ns["_address"]
+        del ns["_locks_address"]
+        del ns["_view"]
+        del ns["_payload_pool"]
         return ns
 
     @guard_internal_use
     def __setstate__(self, state):
         self.__dict__.update(state)
         self.map.start()
+        self._address = self.map._data_for_remote()[0]
+        self._locks_address = self._address + self._size
+        self._view = self.map._payload_view()
         self.blocks = {}
+        self._init_free_blocks()
+        self._payload_pool = {}
+
+    def _init_free_blocks(self):
+        # Interpreter-local stack of indexes of blocks which are likely free.
+        # Blocks are also taken in other interpreters, so entries may be stale:
+        # each one is checked after its block lock is acquired.
+        # Each interpreter starts allocating in its own shard of the board,
+        # so that producers in different interpreters don't contend
+        # for the same blocks - and cache lines.
+        start = self._shard_start()
+        self._free_blocks = [
+            *range(start - 1, -1, -1), *range(self._size - 1, start - 1, -1)
+        ]
+        self._free_lock = threading.Lock()
+        self._free_hint = start
+
+    def _shard_start(self):
+        shards = min(BOARD_SHARDS, self._size // CACHE_LINE) or 1
+        return get_current() % shards * (self._size // shards)
 
     def new_item(self, data):
         """Atomically post a pickled Python object in a
@@ -145,113 +278,193 @@ class LockableBoard:
 
         (All data posted live as an anchor on "self.blocks")
         """
-        data = OwnableBuffer(pickle.dumps(data))
-        offset, control = self.get_free_block()
-        control.content_address, control.content_length = data.map._data_for_remote()
-        self.blocks[offset] = data
-        control.owner = get_current()
+        content_type, chunks, anchors = _serialize(data)
+        length = sum(len(chunk) for chunk in chunks)
+        if length <= INLINE_SIZE and not anchors:
+            # small payloads need no buffer of their own
+            data, inline = None, b"".join(chunks)
+        else:
+            data, inline = self._payload_buffer(chunks, length), b""
+        try:
+            index, control = self.get_free_block()
+        except Exception:
+            # No block for the item ("Board full"): the buffer goes back to the pool
+            if data is not None:
+                self._recycle_payload_buffer(data)
+            raise
+        address = 0
+        if data is not None:
+            address = data.map._data_for_remote()[0]
+            self.blocks[index] = (data, *anchors)
+        # All fields are written while the block lock is held:
+        # releasing the lock is what publishes the item.
+        control._set_values(address, length, get_current(), content_type, inline)
         control.state = State.ready
-        control.lock = 0
-        return offset // BlockLock._size, control
+        _memoryboard._atomic_byte_unlock(self._locks_address + index)
+        return index, control
+
+    def _payload_buffer(self, chunks, length):
+        # Payload buffers are pooled in power of 2 size classes,
+        # so that a steady flow of items reuses the same few buffers.
+        # Chunks are copied one after the other, straight into the buffer.
+        size = max(MIN_POOLED_SIZE, 1 << (length - 1).bit_length())
+        try:
+            data = self._payload_pool[size].pop()
+        except (KeyError, IndexError):
+            data = OwnableBuffer(None, size=size)
+        with data.map._payload_view() as view:
+            position = 0
+            for chunk in chunks:
+                view[position : position + len(chunk)] = chunk
+                position += len(chunk)
+        return data
+
+    def _drop_block_data(self, index):
+        # The block is free: no other interpreter reads its payload anymore.
+        if (entry := self.blocks.pop(index, None)) is None:
+            return
+        self._recycle_payload_buffer(entry[0])
+
+    def _recycle_payload_buffer(self, data):
+        pool = self._payload_pool.setdefault(len(data.map), [])
+        if len(pool) < POOL_DEPTH:
+            pool.append(data)
 
     def __getitem__(self, index):
-        offset = BlockLock._size * index
-        return BlockLock._from_data(self.map, offset)
+        return BlockLock._from_board(self._view, self._size, index, self._meta_offset)
+
+    def _meta_base(self, index):
+        return self._meta_offset + index * BlockLock._size
 
     def __delitem__(self, index):
-        offset = BlockLock._size * index
-        control = BlockLock._from_data(self.map, offset)
-        lock_ptr = self.map._data_for_remote()[0] + offset + 1
-        if not _atomic_byte_lock(lock_ptr):
+        data = self._view
+        lock_ptr = self._locks_address + index
+        if not _memoryboard._atomic_byte_lock(lock_ptr, BLOCK_LOCK_SPINS):
             raise ValueError("Could not get block lock for deleting")
-        if control.state not in (State.not_initialized, State.ready, State.garbage):
+        if data[index] not in (State.not_initialized, State.ready, State.garbage):
+            _memoryboard._atomic_byte_unlock(lock_ptr)
             raise ValueError("Invalid State")
 
-        self.blocks.pop(offset, None)
-        control.state = State.not_initialized
-        control.content_address = 0
-        control.lock = 0
+        self._drop_block_data(index)
+        data[index] = State.not_initialized
+        BlockLock._write_content_address(data, self._meta_base(index), 0)
+        _memoryboard._atomic_byte_unlock(lock_ptr)
+        with self._free_lock:
+            self._free_blocks.append(index)
 
     def collect(self):
-        data = self.map
-        free_blocks = 0
-        for index in range(0, self._size):
-            # block = BlockLock(self.map, offset)
-            # if block.lock == LockState.garbage:
-            # TBD: benchmark things with
-            # the above two lines instead of the "low level":
-            offset = index * BlockLock._size
-            if data[offset] == State.garbage:
-                try:
-                    del self[index]
-                except ValueError:
-                    pass
-            elif index in self.blocks and data[offset] == State.not_initialized:
-                del self.blocks[index]
-            if data[offset] == State.not_initialized:
-                free_blocks += 1
-        return free_blocks
+        data = self._view
+        address = self._address
+        # garbage blocks are reset in a single native pass:
+        # blocks locked elsewhere meanwhile are left for the next call.
+        freed = _memoryboard._reset_blocks(
+            address, self._size, 1, GARBAGE_STATES, self._size
+        )
+        with self._free_lock:
+            self._free_blocks.extend(reversed(freed))
+        # a single copy of the state column:
+        blocks = self.blocks
+        states = bytes(data[: self._size])
+        not_initialized = State.not_initialized
+        for index in [index for index in blocks if states[index] == not_initialized]:
+            self._drop_block_data(index)
+        return _memoryboard._count_blocks(address, self._size, 1, EMPTY_STATES)
 
     def get_free_block(self):
         # maybe call self.collect automatically?
-        id_ = threading.current_thread().native_id
-        data = self.map
-        for offset in range(0, len(data), BlockLock._size):
-            if data[offset] == State.garbage:
-                self.blocks.pop(offset, None)
-                # data[offset] = data[offset + 1] = 0
-            if (
-                data[offset] in (State.not_initialized, State.garbage)
-                and data[offset + 1] == 0
-            ):
-                lock_ptr = self.map._data_for_remote()[0] + offset + 1
-                if not _atomic_byte_lock(lock_ptr):
-                    continue
-                # we are the now sole owners of the block.
-                block = BlockLock._from_data(self.map, offset)
-                block.owner = id_
-                block.state = State.building
-                break
-        else:
+        free_blocks = self._free_blocks
+        free_lock = self._free_lock
+        claim = self._claim_block
+        while True:
+            with free_lock:
+                if not free_blocks:
+                    break
+                index = free_blocks.pop()
+            if block := claim(index):
+                return index, block
+        return self._slow_get_free_block(self._address)
+
+    def _slow_get_free_block(self, address):
+        # Scans the whole board: picks blocks released in other interpreters,
+        # which are never pushed to the local stack of free blocks.
+        # Scanning is next-fit: it resumes after the last block found,
+        # wrapping around, so that full stretches are not rescanned each time.
+        hint = self._free_hint
+        index = _memoryboard._find_and_lock_block(
+            address, self._size, 1, hint, FREE_STATES, self._size
+        )
+        if index < 0 and hint:
+            index = _memoryboard._find_and_lock_block(
+                address, hint, 1, 0, FREE_STATES, self._size
+            )
+        if index < 0:
             raise ValueError(
                 "Board full. Can't allocate data block to send to remote interpreter"
             )
-        return offset, block
+        self._free_hint = (index + 1) % self._size
+        return index, self._take_block(index)
+
+    def _claim_block(self, index):
+        lock_ptr = self._locks_address + index
+        if not _memoryboard._atomic_byte_lock(lock_ptr):
+            return None
+        if self._view[index] not in _FREE_STATE_VALUES:
+            # block was taken since it was found to be free
+            _memoryboard._atomic_byte_unlock(lock_ptr)
+            return None
+        return self._take_block(index)
+
+    def _take_block(self, index):
+        # we are the now sole owners of the block.
+        self._drop_block_data(index)
+        BlockLock._write_owner(
+            self._view, self._meta_base(index), threading.current_thread().native_id
+        )
+        self._view[index] = State.building
+        return self[index]
 
     def fetch_item(self):
         """Atomically retrieves an item posted with "new_item" and frees its block"""
-        control = BlockLock._from_data(self.map, 0)
-        interp_list = raw_list_all()
-        for index in range(0, self._size):
-            offset = index * BlockLock._size
-            control._offset = offset
-            if control.state != State.ready:
-                continue
-            lock_ptr = self.map._data_for_remote()[0] + offset + 1
-            if not _atomic_byte_lock(lock_ptr):
-                continue
-            if control.owner not in interp_list:
+        data = self._view
+        live_interps = cached_interp_set()
+        index = -1
+        while (
+            index := _memoryboard._find_and_lock_block(
+                self._address, self._size, 1, index + 1, READY_STATES, self._size
+            )
+        ) >= 0:
+            lock_ptr = self._locks_address + index
+            address, length, owner, content_type, inline = (
+                BlockLock._struct.unpack_from(data, self._meta_base(index))
+            )
+            # Closing an interpreter anywhere invalidates the cached set:
+            # it only has to be refreshed for owners it does not list.
+            if owner not in live_interps and owner not in (
+                live_interps := cached_interp_set(ttl=0)
+            ):
                 # Counter consumed by queues: they have to fetch
                 # a byte on the notification pipe if an item
                 # vanished due to this.
                 self._items_closed_interpreters += 1
-                control.state = State.garbage
-                control.lock = 0
+                data[index] = State.garbage
+                _memoryboard._atomic_byte_unlock(lock_ptr)
                 continue
             break
         else:
             return None
-        # control.owner = threading.current_thread().native_id
-        control.state = State.locked
-        control.lock = 0
-        buffer = _remote_memory(control.content_address, control.content_length)
+        if not address:
+            buffer = inline[:length]
+        data[index] = State.locked
+        _memoryboard._atomic_byte_unlock(lock_ptr)
+        if address:
+            buffer = _memoryboard._remote_memory(address, length)
         try:
-            item = pickle.loads(buffer)
+            item = _deserialize(content_type, buffer)
         finally:
             del buffer
         # Maybe add an option to "peek" an item only?
         # all that would be needed would be to restore state to "ready"
-        control.state = State.garbage
+        data[index] = State.garbage
         # TBD: caller could have a channel to comunicate the parent thread its done
         # with the buffer.
         return index, item
@@ -262,6 +475,9 @@ class LockableBoard:
 
     def close(self):
         if hasattr(self, "map") and self.map:
+            if getattr(self, "_view", None) is not None:
+                self._view.release()
+                self._view = None
             self.map.close()
             self.map = None
 
@@ -274,13 +490,153 @@ class LockableBoard:
         return f"LockableBoard with {free_blocks} free slots."
 
 
+# out-of-band buffer count and pickle stream length:
+_OOB_HEADER = struct.Struct("<QQ")
+# address and length of each out-of-band buffer
+_OOB_ENTRY = struct.Struct("<QQ")
+_INT64 = struct.Struct("<q")
+_FLOAT64 = struct.Struct("<d")
+# dimensions and format length of a memoryview
+_VIEW_HEADER = struct.Struct("<BB")
+
+# bound once: these are called for every item posted or fetched
+_pickle_dumps = pickle.dumps
+_pickle_loads = pickle.loads
+
+
+def _serialize(data):
+    """Returns the content type, payload chunks and anchors for posting "data" in a board
+
+    Exact ints that fit in 64 bits, floats, bytes, bytearrays and
+    contiguous memoryviews skip pickle entirely.
+    """
+    data_type = type(data)
+    if data_type is int and -(1 << 63) <= data < 1 << 63:
+        return ContentType.int64, [_INT64.pack(data)], ()
+    if data_type is float:
+        return ContentType.float64, [_FLOAT64.pack(data)], ()
+    if data_type is bytes:
+        return ContentType.raw_bytes, [data], ()
+    if data_type is bytearray:
+        return ContentType.raw_bytearray, [data], ()
+    if data_type is str:
+        return ContentType.text, [data.encode("utf-8", "surrogatepass")], ()
+    if data is None:
+        return ContentType.none, [], ()
+    if data_type is bool:
+        return ContentType.boolean, [b"\x01" if data else b"\x00"], ()
+    if data_type is memoryview and (chunks := _pack_memoryview(data)):
+        return ContentType.raw_memoryview, chunks, ()
+    buffers = []
+    payload = _pickle_dumps(
+        data, protocol=pickle.HIGHEST_PROTOCOL, buffer_callback=buffers.append
+    )
+    if buffers:
+        return ContentType.pickled_oob, *_pack_out_of_band(payload, buffers)
+    return ContentType.pickled, [payload], ()
+
+
+def _deserialize(content_type, buffer):
+    if content_type == ContentType.pickled:
+        return _pickle_loads(buffer)
+    if content_type == ContentType.pickled_oob:
+        return _unpack_out_of_band(buffer)
+    if content_type == ContentType.int64:
+        return _INT64.unpack(buffer)[0]
+    if content_type == ContentType.float64:
+        return _FLOAT64.unpack(buffer)[0]
+    if content_type == ContentType.raw_bytes:
+        return bytes(buffer)
+    if content_type == ContentType.text:
+        return str(buffer, "utf-8", "surrogatepass")
+    if content_type == ContentType.none:
+        return None
+    if content_type == ContentType.raw_bytearray:
+        return bytearray(buffer)
+    if content_type == ContentType.boolean:
+        return buffer[0] == 1
+    if content_type == ContentType.raw_memoryview:
+        return _unpack_memoryview(buffer)
+    raise ValueError(f"Unknown board content type {content_type}")
+
+
+def _pack_memoryview(view):
+    # The raw bytes are copied straight into the payload, and the view is
+    # rebuilt over a copy of them: only views which can be cast back
+    # from plain bytes into their format and shape are taken.
+    if not view.c_contiguous:
+        return None
+    raw = view.cast("B")
+    try:
+        raw.cast(view.format, view.shape)
+    except (TypeError, ValueError):
+        return None
+    format = view.format.encode("ascii")
+    header = _VIEW_HEADER.pack(view.ndim, len(format))
+    return [header, struct.pack(f"<{view.ndim}Q", *view.shape), format, raw]
+
+
+def _unpack_memoryview(data):
+    ndim, format_length = _VIEW_HEADER.unpack_from(data)
+    start = _VIEW_HEADER.size + 8 * ndim
+    shape = struct.unpack_from(f"<{ndim}Q", data, _VIEW_HEADER.size)
+    format = str(data[start : start + format_length], "ascii")
+    raw = bytearray(data[start + format_length :])
+    return memoryview(raw).cast(format, shape)
+
+
+def _pack_out_of_band(payload, buffers):
+    """Lay out a protocol 5 pickle and its out-of-band buffers as payload chunks
+
+    The payload starts with a table with the address and length of each
+    buffer. Read-only buffers are shared in place, with no copy at all.
+    Writable ones are copied once, after the pickle stream, in the same
+    payload (their address in the table is 0), so that later changes
+    in this interpreter don't leak into the item.
+    Either way, the data is not serialized inside the pickle stream.
+    Returns the chunks and the objects which must be kept alive
+    until the item is consumed.
+    """
+    anchors = []
+    table = []
+    inline = []
+    for buffer in buffers:
+        raw = buffer.raw()
+        if raw.readonly:
+            anchors.append(buffer)
+            table.extend(_memoryboard._address_and_size(raw))
+        else:
+            inline.append(raw)
+            table.extend((0, raw.nbytes))
+    header = _OOB_HEADER.pack(len(buffers), len(payload))
+    return [header, struct.pack(f"<{len(table)}Q", *table), payload, *inline], anchors
+
+
+def _unpack_out_of_band(data):
+    count, pickle_length = _OOB_HEADER.unpack_from(data)
+    start = _OOB_HEADER.size + _OOB_ENTRY.size * count
+    table = _OOB_ENTRY.iter_unpack(data[_OOB_HEADER.size : start])
+    position = start + pickle_length
+    # Buffers are copied into interpreter-local memory: the
+    # originating interpreter is free to dispose of them as soon as
+    # the block is marked as garbage.
+    buffers = []
+    for address, length in table:
+        if address:
+            buffers.append(bytearray(_memoryboard._remote_memory(address, length)))
+        else:
+            buffers.append(bytearray(data[position : position + length]))
+            position += length
+    return _pickle_loads(data[start : start + pickle_length], buffers=buffers)
+
+
 class OwnableBuffer(BufferBase):
-    def __init__(self, payload):
+    def __init__(self, payload, size=None):
         """'use-once' read-only buffer meant to be read by a single peer
 
         The addresses and lock-blocks should be stored in a
         LockableBoard object.
         """
 
-        self.map = RemoteArray(payload=payload)
+        self.map = RemoteArray(size=size, payload=payload)
         self.map.start()
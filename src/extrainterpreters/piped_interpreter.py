@@ -52,17 +52,20 @@ def _dispatcher(pipe, buffer):
             data = pipe.read(timeout=0.1)
             if not data:
                 continue
-            command = Command._from_data(data)
-            match command.opcode:
+            # All header fields are decoded at once, by the precompiled struct:
+            opcode, exec_mode, data_record, _ = Command._struct.unpack_from(data)
+            match opcode:
                 case WO.close:
                     break
                 case WO.run_func_args_kwargs:
-                    funcdata = FuncData(buffer, FuncData._size * command.data_record)
-                    buffer.seek(funcdata.data_offset)
-                    func = pickle.load(buffer)
-                    args = pickle.load(buffer)
-                    kwargs = pickle.load(buffer)
-                    if command.exec_mode == ExecModes.immediate:
+                    data_offset = FuncData._read_data_offset(
+                        buffer, FuncData._size * data_record
+                    )
+                    reader = buffer.reader(data_offset)
+                    func = pickle.load(reader)
+                    args = pickle.load(reader)
+                    kwargs = pickle.load(reader)
+                    if exec_mode == ExecModes.immediate:
                         result = func(*args, **kwargs)
                         pipe.send(pickle.dumps(result))
 
@@ -104,20 +107,15 @@ class PipedInterpreter(_BufferedInterpreter):
     def execute(self, func, args=(), kwargs=None):
         # WIP: find out free range in buffer
         slot = 0
-        cmd = Command(
-            opcode=WO.run_func_args_kwargs,
-            exec_mode=ExecModes.immediate,
-            data_record=slot,
-            data_extra=0,
-        )
         data_offset = self.buffer.nranges["send_data"]
         self.map.seek(data_offset)
         pickle.dump(func, self.map)
         pickle.dump(args, self.map)
         pickle.dump(kwargs, self.map)
-        exec_data = FuncData._from_data(self.map, slot * FuncData._size)
-        exec_data.data_offset = data_offset
-        self.pipe.send(cmd._bytes)
+        FuncData._write_data_offset(self.map, slot * FuncData._size, data_offset)
+        self.pipe.send(
+            Command._struct.pack(WO.run_func_args_kwargs, ExecModes.immediate, slot, 0)
+        )
 
     def result(self):
         # if last command exec_mode was "immediate":
@@ -129,7 +127,7 @@ class PipedInterpreter(_BufferedInterpreter):
 
     def _close_channel(self):
         with self.lock:
-            self.pipe.send(Command._from_values(WO.close, 0, 0, 0)._bytes)
+            self.pipe.send(Command._struct.pack(WO.close, 0, 0, 0))
             self.pipe.read(timeout=None)
             self.pipe.close()
         super()._close_channel()
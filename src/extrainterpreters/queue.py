@@ -1,12 +1,28 @@
+import math
 import os
 import pickle
+import select
 import selectors
+import struct
+import sys
 import time
 import warnings
 from collections import deque
-from functools import wraps
+from contextlib import suppress
+from functools import cache
 from textwrap import dedent as D
 
+try:
+    import fcntl
+    import termios
+
+    _F_GETPIPE_SZ = fcntl.F_GETPIPE_SZ
+except (ImportError, AttributeError):
+    # pipe capacity can't be queried on this platform
+    _F_GETPIPE_SZ = None
+else:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
 import queue as threading_queue
 from queue import Empty, Full  #  make these available to users
 
@@ -20,7 +36,7 @@ from .utils import (
 )
 from .remote_array import RemoteArray, RemoteState
 from .memoryboard import LockableBoard
-from . import interpreters, get_current
+from . import interpreters, get_current, _memoryboard
 from .resources import EISelector, register_pipe, PIPE_REGISTRY
 
 
@@ -28,9 +44,90 @@ from .resources import EISelector, register_pipe, PIPE_REGISTRY
 # (default for timeout=None should be "wait forever" everywhere)
 _DEFAULT_BLOCKING_TIMEOUT = 5  #
 
+# Writes up to this size never stop partway through
+_PIPE_BUF = getattr(select, "PIPE_BUF", 512)
+
+# Most buffers a single os.writev or os.readv call takes
+try:
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 1024
+
+# Size of each read issued when "readline" has to refill the local buffer
+_READ_CHUNK = 4096
+_READ_ROOM = bytes(_READ_CHUNK)
+
+# Each item sent through a SingleQueue pipe is prefixed with the length
+# of its pickle and the number of its out-of-band buffers, followed by the
+# length of each buffer. The buffers themselves come after the pickle.
+_ITEM_HEADER = struct.Struct("<II")
+_BUFFER_LENGTH = struct.Struct("<Q")
+
+# struct format codes for the field types a SingleQueue schema can have
+_SCHEMA_FORMATS = {int: "q", float: "d", bool: "?"}
+
+# bound once: these are called for every item sent or received
+_pickle_dumps = pickle.dumps
+_pickle_loads = pickle.loads
+
+
+def _poll_ready(poller, timeout):
+    # "poll" takes a timeout in milliseconds - and None to wait forever
+    if timeout is not None:
+        timeout = math.ceil(timeout * 1000) if timeout > 0 else 0
+    return bool(poller.poll(timeout))
+
+
+def _schema_struct(schema):
+    """Precompiled struct for items of a NamedTuple class with int, float and bool fields"""
+    try:
+        field_types = [schema.__annotations__[name] for name in schema._fields]
+    except (AttributeError, KeyError):
+        raise TypeError(f"{schema!r} is not a NamedTuple class with annotated fields")
+    try:
+        formats = [_SCHEMA_FORMATS[field_type] for field_type in field_types]
+    except KeyError as error:
+        raise TypeError(f"Unsupported field type in queue schema: {error}")
+    return struct.Struct("<" + "".join(formats))
+
+
+def _pipe_room(fd):
+    """Usable capacity of the pipe with the writer end "fd", and the room left in it
+
+    Pipes hold data in pages, and the first and last ones may be partly
+    used: two pages are kept out of the counts, so that a write of up to
+    the room returned does not block. Returns None where these can't be measured.
+    """
+    if _F_GETPIPE_SZ is None:
+        return None
+    try:
+        capacity = fcntl.fcntl(fd, _F_GETPIPE_SZ)
+        queued = bytearray(4)
+        fcntl.ioctl(fd, termios.FIONREAD, queued)
+    except OSError:
+        return None
+    pages = capacity // _PAGE_SIZE - 2
+    used = int.from_bytes(queued, sys.byteorder) // _PAGE_SIZE
+    return pages * _PAGE_SIZE, max(pages - used, 0) * _PAGE_SIZE
+
+
+def _skip_written(chunks, written):
+    # the part of "chunks" left after "written" bytes were sent
+    views = []
+    for chunk in chunks:
+        chunk = memoryview(chunk).cast("B")
+        if written >= len(chunk):
+            written -= len(chunk)
+            continue
+        views.append(chunk[written:])
+        written = 0
+    return views
+
 
 class ActiveInstance(StructBase):
-    counter = Field(2)
+    # an aligned 32 bit integer, so that it can be
+    # atomically changed without the lock:
+    counter = Field(4)
 
 
 class _PipeBase:
@@ -50,32 +147,81 @@ class _PipeBase:
         if self._lock_array._data is None:
             self._lock_array.start()
         self.lock = self._lock_array._lock
-        with self.lock:
-            self.active.counter += 1
+        self._add_to_counter(1)
+        # Bytes already pulled from the fd by "readline" but not consumed yet.
+        # Only "readline" reads ahead: signaling pipes shared across
+        # interpreters rely on "read(1)" taking exactly one byte from the fd.
+        self._rbuf = bytearray()
+        self._rbuf_pos = 0
+        # With non-blocking fds a stale readiness flag costs an EAGAIN
+        # instead of hanging the interpreter in "os.read"; and writes
+        # need no select call while there is room in the pipe.
+        os.set_blocking(self.reader_fd, False)
+        os.set_blocking(self.writer_fd, False)
+        # Waiting on a single known fd needs no trip through the
+        # interpreter-wide selector and its callbacks:
+        self._read_poller = select.poll()
+        self._read_poller.register(self.reader_fd, select.POLLIN)
+        self._write_poller = select.poll()
+        self._write_poller.register(self.writer_fd, select.POLLOUT)
+
+    def _add_to_counter(self, delta):
+        # Returns the count of open instances before the change
+        address = self._lock_array._data_for_remote()[0]
+        address += ActiveInstance.counter.offset
+        return _memoryboard._atomic_add_u32(address, delta & 0xFFFFFFFF)
+
+    def _pickle_state(self):
+        # poll objects can't be pickled: "_post_init" creates new ones
+        state = self.__dict__.copy()
+        state.pop("_read_poller", None)
+        state.pop("_write_poller", None)
+        return state
+
+    def _drain(self, amount):
+        pos = self._rbuf_pos
+        chunk = bytes(self._rbuf[pos : pos + amount])
+        pos += len(chunk)
+        if pos >= len(self._rbuf):
+            self._rbuf.clear()
+            pos = 0
+        self._rbuf_pos = pos
+        return chunk
 
     def readline(self):
         # needed by pickle.load
-        result = []
-        read_byte = ...
-        while read_byte and read_byte != "\n":
-            result.append(read_byte := self.read(1))
-        return b"".join(result)
-
+        if self.closed:
+            warnings.warn("Pipe already closed. Not trying to read anything")
+            return b""
+        rbuf = self._rbuf
+        while (index := rbuf.find(b"\n", self._rbuf_pos)) < 0:
+            del rbuf[: self._rbuf_pos]
+            self._rbuf_pos = 0
+            # Read straight into room at the end of the local buffer,
+            # rather than into a new bytes object to be appended later
+            end = len(rbuf)
+            rbuf += _READ_ROOM
+            with memoryview(rbuf) as view:
+                count = self._readinto_fd(view[end:])
+            del rbuf[end + count :]
+            if not count:
+                return self._drain(len(rbuf))
+        return self._drain(index + 1 - self._rbuf_pos)
+
+    # The ready flags are only set when EISelector.select is driven
+    # for several fds at once: waiting on a single pipe goes straight
+    # to its own poll object, in "select" and "select_for_write".
     def _read_ready_callback(self, key, *args):
         self._read_ready_flag = True
 
     def select(self, timeout=0):
-        self._read_ready_flag = False
-        EISelector.select(timeout=timeout, target_fd=self.reader_fd)
-        return self._read_ready_flag
+        return _poll_ready(self._read_poller, timeout)
 
     def _write_ready_callback(self, *args):
         self._write_ready_flag = True
 
     def select_for_write(self, timeout=None):
-        self._write_ready_flag = False
-        EISelector.select(timeout=timeout, target_fd=self.writer_fd)
-        return self._write_ready_flag
+        return _poll_ready(self._write_poller, timeout)
 
     def send(self, data, timeout=None):
         if self.closed:
@@ -83,25 +229,162 @@ class _PipeBase:
             return
         if isinstance(data, str):
             data = data.encode("utf-8")
-        if self.select_for_write(timeout):
-            return os.write(self.writer_fd, data)
-
-        raise TimeoutError("FD not ready for writting - Pipe full")
+        return self.send_chunks([data], timeout)
 
     write = send
 
+    def send_chunks(self, chunks, timeout=None):
+        """Sends several buffers with a single system call, without joining them
+
+        A message is never left half written: if "timeout" expires
+        before there is room for it, TimeoutError is raised and nothing
+        is sent. Once part of it is in the pipe, the rest always follows.
+        With a timeout of 0, the whole message has to fit in the pipe.
+        """
+        if self.closed:
+            warnings.warn("Pipe already closed. No data sent")
+            return
+        total = sum(map(len, chunks))
+        deadline = None if timeout is None else time.monotonic() + timeout
+        sent = 0
+        # Writes of up to PIPE_BUF bytes go in whole or not at all:
+        # larger ones could stop partway, so they wait for room first.
+        check_room = deadline is not None and total > _PIPE_BUF
+        while True:
+            if check_room and not sent:
+                # Nothing is in the pipe yet: the message can still be given up
+                if not self._wait_for_room(total, deadline, whole=timeout == 0):
+                    raise TimeoutError("FD not ready for writting - Pipe full")
+            # The writer fd is non-blocking: while the pipe has room,
+            # data goes out with no trip through the selector.
+            try:
+                written = os.writev(self.writer_fd, chunks[:_IOV_MAX])
+            except BlockingIOError:
+                written = 0
+            sent += written
+            if sent >= total:
+                return total
+            if written:
+                chunks = _skip_written(chunks, written)
+            if sent or deadline is None:
+                self.select_for_write(None)
+            elif not self.select_for_write(deadline - time.monotonic()):
+                raise TimeoutError("FD not ready for writting - Pipe full")
+
+    def _wait_for_room(self, total, deadline, whole=False):
+        # Messages larger than the pipe can only start once it is
+        # (nearly) empty, and are then sent in parts, as the reader drains them.
+        delay = 0.0005
+        while True:
+            remaining = deadline - time.monotonic()
+            if (room := _pipe_room(self.writer_fd)) is None:
+                # Room can't be measured: make do with a writable fd
+                return self.select_for_write(max(remaining, 0))
+            capacity, free = room
+            if free >= (total if whole else min(total, capacity)):
+                return True
+            if remaining <= 0:
+                return False
+            # "poll" would report the pipe writable as soon as a single
+            # page is free: too early for most messages.
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.05)
+
+    def _read_fd(self, amount, timeout=0):
+        # Try the read first: only go through the selector if nothing
+        # is waiting in the pipe.
+        try:
+            return os.read(self.reader_fd, amount)
+        except BlockingIOError:
+            # The pipe is empty: any readiness flag is stale, and
+            # with no timeout there is no point in selecting.
+            self._read_ready_flag = False
+            if timeout == 0:
+                return b""
+        while self.select(timeout):
+            try:
+                return os.read(self.reader_fd, amount)
+            except BlockingIOError:
+                # Readiness was stale: data was taken by another reader
+                continue
+        return b""
+
+    def _readinto_fd(self, view, timeout=0):
+        # Same as "_read_fd", filling "view" and returning the count read
+        try:
+            return os.readv(self.reader_fd, [view])
+        except BlockingIOError:
+            self._read_ready_flag = False
+            if timeout == 0:
+                return 0
+        while self.select(timeout):
+            try:
+                return os.readv(self.reader_fd, [view])
+            except BlockingIOError:
+                continue
+        return 0
+
     def read_blocking(self, amount=4096):
-        result = os.read(self.reader_fd, amount)
-        return result
+        if self._rbuf:
+            return self._drain(amount)
+        return self._read_fd(amount, timeout=None)
+
+    def read_exactly(self, amount):
+        """Blocks until "amount" bytes are read - returned in a new bytearray"""
+        return self.readinto_exactly(bytearray(amount))
+
+    def readinto_exactly(self, buffer):
+        """Blocks until "buffer" is filled"""
+        view = memoryview(buffer).cast("B")
+        position = len(chunk := self._drain(len(view))) if self._rbuf else 0
+        if position:
+            view[:position] = chunk
+        while position < len(view):
+            # Reads as much as the pipe has, in native code, in a loop
+            # which only comes back here when the pipe runs dry
+            try:
+                count = _memoryboard._fill_from_fd(self.reader_fd, view[position:])
+            except BlockingIOError:
+                self.select(timeout=None)
+                continue
+            if not count:
+                raise EOFError("Pipe closed by the other end")
+            position += count
+        return buffer
+
+    def readinto_all(self, buffers):
+        """Blocks until all "buffers" are filled, in order
+
+        Gathers data for several buffers in each system call.
+        """
+        views = [memoryview(buffer).cast("B") for buffer in buffers]
+        filled = 0
+        for view in views:
+            if not self._rbuf:
+                break
+            chunk = self._drain(len(view))
+            view[: len(chunk)] = chunk
+            filled += len(chunk)
+        views = _skip_written(views, filled)
+        while views:
+            try:
+                count = os.readv(self.reader_fd, views[:_IOV_MAX])
+            except BlockingIOError:
+                self.select(timeout=None)
+                continue
+            if not count:
+                raise EOFError("Pipe closed by the other end")
+            views = _skip_written(views, count)
+        return buffers
 
     def read(self, amount=4096, timeout=0):
         if self.closed:
             warnings.warn("Pipe already closed. Not trying to read anything")
             return b""
-        result = b""
-        if self.select(timeout):
-            return self.read_blocking(amount)
-        return b""
+        result = self._drain(amount) if self._rbuf else b""
+        if len(result) < amount:
+            result += self._read_fd(amount - len(result), 0 if result else timeout)
+        return result
 
     def close(self):
         # FIXME: embedd a shared buffer struct with a count of instances
@@ -109,24 +392,23 @@ class _PipeBase:
         # calls  :close" (or __del__), close the fds
         if getattr(self, "lock", None):
             with self.lock:
-                all_fds = getattr(self, "_all_fds", ())
+                registry_key = getattr(self, "_all_fds", ())
+                # both ends of an event counter are the same fd:
+                all_fds = tuple(dict.fromkeys(registry_key))
                 for fd in all_fds:
-                    try:
+                    with suppress(KeyError):
                         EISelector.unregister(fd)
-                    except KeyError:
-                        pass
-                if all_fds in PIPE_REGISTRY:
-                    del PIPE_REGISTRY[self._all_fds]
+                PIPE_REGISTRY.pop(registry_key, None)
                 # Close file descriptors if this was the last
                 # interpreter where they are open:
-                if self.active.counter:
-                    self.active.counter -= 1
-                if self.active.counter == 0:
-                    for fd in getattr(self, "_all_fds", ()):
-                        try:
+                previous = self._add_to_counter(-1)
+                if previous == 0:
+                    # already at zero: undo the wrap around
+                    self._add_to_counter(1)
+                if previous <= 1:
+                    for fd in all_fds:
+                        with suppress(OSError):
                             os.close(fd)
-                        except OSError:
-                            pass
         self.closed = True
         self._all_fds = ()
         self.reader_fd = None
@@ -166,7 +448,7 @@ class _SimplexPipe(_PipeBase):
         return (
             type(self)._unpickler,
             (self.reader_fd, self.writer_fd),
-            self.__dict__.copy(),
+            self._pickle_state(),
         )
 
     # @guard_internal_use
@@ -193,6 +475,64 @@ class _SimplexPipe(_PipeBase):
         super()._post_init()
 
 
+class _EventCounter(_SimplexPipe):
+    """Signaling channel over a Linux eventfd, with the interface of _SimplexPipe
+
+    Each byte sent adds one to a counter in the kernel, and each read
+    takes one back, returned as a single byte: the same thing a one-way
+    pipe carrying single-byte signals does. But the counter never fills
+    up, so writes never wait, and a single fd is used for both ends.
+
+    Only signals go through it: use "read" and "write", not the
+    methods reading pickled data or lines.
+    """
+
+    def __init__(self):
+        fd = os.eventfd(0, os.EFD_SEMAPHORE | os.EFD_NONBLOCK)
+        self.reader_fd, self.writer_fd = self._all_fds = register_pipe((fd, fd), self)
+        _PipeBase.__init__(self)
+        self._post_init()
+        self._bound_interp = get_current()
+
+    def _post_init(self):
+        self.closed = False
+        # The eventfd is always writable: only reading is watched
+        EISelector.register(
+            self.reader_fd, selectors.EVENT_READ, self._read_ready_callback
+        )
+        self._read_ready_flag = False
+        self._write_ready_flag = False
+        _PipeBase._post_init(self)
+
+    def select_for_write(self, timeout=None):
+        return True
+
+    def send_chunks(self, chunks, timeout=None):
+        if self.closed:
+            warnings.warn("Pipe already closed. No data sent")
+            return
+        total = sum(map(len, chunks))
+        if total:
+            os.eventfd_write(self.writer_fd, total)
+        return total
+
+    def _read_fd(self, amount, timeout=0):
+        while True:
+            try:
+                os.eventfd_read(self.reader_fd)
+            except BlockingIOError:
+                self._read_ready_flag = False
+                if timeout == 0 or not self.select(timeout):
+                    return b""
+            else:
+                return b"\x01"
+
+
+# Signals from Queue producers to consumers: an eventfd where
+# the platform has one - a regular pipe otherwise
+_SignalChannel = _EventCounter if hasattr(os, "eventfd") else _SimplexPipe
+
+
 class _DuplexPipe(_PipeBase):
     """Full Duplex Pipe class.
 
@@ -214,7 +554,7 @@ class _DuplexPipe(_PipeBase):
     # is automatically promoted to be "the other end"
     # of the Pipe that was pickled in parent interpreter
     def __getstate__(self):
-        state = self.__dict__.copy()
+        state = self._pickle_state()
         state.pop("_counterpart", None)
         return state
 
@@ -262,28 +602,58 @@ class _DuplexPipe(_PipeBase):
         return new_inst
 
 
-def _parent_only(func):
-    @wraps(func)
-    def wrapper(self, *args, **kw):
-        if self.mode != _InstMode.parent:
-            raise RuntimeError(
-                f"Invalid queue state: {func.__name__} can only be called on parent interpreter"
-            )
-        return func(self, *args, **kw)
+def _mode_only(mode):
+    # Methods run with no check of their own: "_bind_mode" shadows them,
+    # in instances on the other side, with a function that just raises.
+    def decorator(func):
+        func._queue_mode = mode
+        return func
 
-    return wrapper
+    return decorator
 
 
-def _child_only(func):
-    @wraps(func)
-    def wrapper(self, *args, **kw):
-        if self.mode != _InstMode.child:
-            raise RuntimeError(
-                f"Invalid queue state: {func.__name__} can only be called on child interpreter"
-            )
-        return func(self, *args, **kw)
+_parent_only = _mode_only(_InstMode.parent)
+_child_only = _mode_only(_InstMode.child)
+
 
-    return wrapper
+@cache
+def _mode_methods(cls):
+    return tuple(
+        (name, obj._queue_mode)
+        for name in dir(cls)
+        if hasattr(obj := getattr(cls, name), "_queue_mode")
+    )
+
+
+def _wrong_side(name, mode):
+    # Called with no "self": kept in the instance "__dict__", a bound
+    # method would put each queue in a reference cycle, delaying "__del__".
+    def method(*args, **kw):
+        raise RuntimeError(
+            f"Invalid queue state: {name} can only be called on {mode} interpreter"
+        )
+
+    return method
+
+
+def _bind_mode(instance, mode):
+    """Blocks, on "instance", the methods valid only on the other side of the queue
+
+    Called once an instance knows its mode: when it is created or unpickled.
+    """
+    for name, method_mode in _mode_methods(type(instance)):
+        if method_mode == mode:
+            instance.__dict__.pop(name, None)
+        else:
+            instance.__dict__[name] = _wrong_side(name, method_mode)
+
+
+def _unbound_state(instance):
+    # instance state to be pickled, without the blocked methods
+    state = instance.__dict__.copy()
+    for name, _ in _mode_methods(type(instance)):
+        state.pop(name, None)
+    return state
 
 
 class _ABSQueue:
@@ -305,28 +675,28 @@ class SingleQueue(_ABSQueue):
     Instances can be in two states: parent side or child side. When unpickled on
     a sub-interpreter, the instance will assume the "child side" state  -
     appropriate methods should only be used in each side. (basically: put on parent, get on child)
+
+    If "schema" is given, it must be a typing.NamedTuple class with only
+    int, float or bool fields: items are then sent as their packed values,
+    with no pickling, and retrieved as instances of "schema".
     """
 
     mode = _InstMode.parent
 
-    @_parent_only
-    def __init__(self, maxsize=0):
+    def __init__(self, maxsize=0, schema=None):
         self.maxsize = maxsize
+        self.schema = schema
+        self._schema_struct = None if schema is None else _schema_struct(schema)
         self.pipe = _DuplexPipe()
         self.mode = _InstMode.parent
         self.bound_to_interp = get_current()
         self._size = 0
-        self._post_init_parent()
-
-    def _post_init_parent(self):
-        self._writing_fd = self.pipe.originator_fds[1]
-        EISelector.register(
-            self._writing_fd, selectors.EVENT_WRITE, self._ready_to_write
-        )
-        self._ready_to_write_flag = False
+        _bind_mode(self, self.mode)
 
     def __getstate__(self):
-        state = self.__dict__.copy()
+        state = _unbound_state(self)
+        # Struct objects can't be pickled: rebuilt from "schema"
+        state.pop("_schema_struct", None)
         return state
 
     @guard_internal_use
@@ -334,10 +704,13 @@ class SingleQueue(_ABSQueue):
         from . import interpreters
 
         self.__dict__.update(state)
-        if self.pipe._bound_interp == get_current():
-            self._post_init_parent()
-        else:
+        schema = state.get("schema")
+        self._schema_struct = None if schema is None else _schema_struct(schema)
+        if self.pipe._bound_interp != get_current():
             self.mode = _InstMode.child
+            # "task_done" calls not yet posted to the parent
+            self._pending_acks = 0
+        _bind_mode(self, self.mode)
 
     @property
     def size(self):
@@ -345,8 +718,7 @@ class SingleQueue(_ABSQueue):
         # other end of pipe should post, as an unsigned byte,
         # the amount of tasks confirmed with ".task_done()"
         if amount := self.pipe.read():
-            for done_count in amount:
-                self._size -= done_count
+            self._size -= sum(amount)
         return self._size
 
     def qsize(self):
@@ -366,52 +738,76 @@ class SingleQueue(_ABSQueue):
             return True
         return self.size >= self.maxsize
 
-    def _ready_to_write(self, *args):
-        self._ready_to_write_flag = True
-
     def _ready_to_send(self, timeout=0):
-        EISelector.select(timeout=timeout, target_fd=self._writing_fd)
-        result = self._ready_to_write_flag
-        self._ready_to_write_flag = False
-        return result
+        return self.pipe.select_for_write(timeout)
 
     @_parent_only
     def put(self, item, block=True, timeout=None):
         """Put item into the queue. If optional args block is true and timeout is None (the default), block if necessary until a free slot is available. If timeout is a positive number, it blocks at most timeout seconds and raises the Full exception if no free slot was available within that time. Otherwise (block is false), put an item on the queue if a free slot is immediately available, else raise the Full exception (timeout is ignored in that case)."""
-        ready = False
-        if self._ready_to_send():
-            ready = True
-
-        if self.maxsize > 0 and self.size >= self.maxsize:
-            ready = False
-
-        if not block and not ready:
-            raise threading_queue.Full()
-
-        now = time.time()
-        ready = self._ready_to_send(timeout)
+        if not block:
+            timeout = 0
+        deadline = None if timeout is None else time.monotonic() + timeout
         while self.maxsize > 0 and self.size >= self.maxsize:
-            if time.time() - now > timeout:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
                 raise threading_queue.Full()
-            time.sleep(0.05)
-            ready = self._ready_to_send()
-
-        if not ready:
-            raise threading_queue.Full()
+            # Sleeps until the other end posts "task done" counts
+            # in the pipe - which are then drained by "self.size"
+            self.pipe.select(remaining)
 
         # TBD: check for safety on pickle size:
         # large objects should be sent via memory buffer
         # (which will likely be implemented in a fullQueue
         # - which can be produced and consumed by
         # arbitrary interpreters, before finished up here)
-        self.pipe.send(pickle.dumps(item))
+        # Large contiguous buffers in the item are not copied
+        # into the pickle stream: they go straight to the pipe.
+        buffers = []
+        if self._schema_struct is not None:
+            payload = self._schema_struct.pack(*item)
+        else:
+            payload = _pickle_dumps(
+                item,
+                protocol=pickle.HIGHEST_PROTOCOL,
+                buffer_callback=lambda buffer: buffers.append(buffer.raw()),
+            )
+        # No probing for room in the pipe first: the write is just tried,
+        # and only waits for the pipe to drain if it would block.
+        remaining = None if deadline is None else max(0, deadline - time.monotonic())
+        try:
+            self.pipe.send_chunks(
+                [
+                    _ITEM_HEADER.pack(len(payload), len(buffers)),
+                    struct.pack(
+                        f"<{len(buffers)}Q", *(buffer.nbytes for buffer in buffers)
+                    ),
+                    payload,
+                    *buffers,
+                ],
+                remaining,
+            )
+        except TimeoutError:
+            raise threading_queue.Full()
         self._size += 1
 
     @_child_only
     def get(self, block=True, timeout=None):
         """Remove and return an item from the queue. If optional args block is true and timeout is None (the default), block if necessary until an item is available. If timeout is a positive number, it blocks at most timeout seconds and raises the Empty exception if no item was available within that time. Otherwise (block is false), return an item if one is immediately available, else raise the Empty exception (timeout is ignored in that case)."""
         # TBD: many fails. fix
-        return pickle.load(self.pipe)
+        header = self.pipe.read(_ITEM_HEADER.size)
+        if len(header) < _ITEM_HEADER.size:
+            # About to wait for the parent: it must know of finished tasks first
+            self._flush_acks()
+            header += self.pipe.read_exactly(_ITEM_HEADER.size - len(header))
+        length, count = _ITEM_HEADER.unpack(header)
+        sizes = self.pipe.read_exactly(count * _BUFFER_LENGTH.size)
+        payload = bytearray(length)
+        buffers = [bytearray(size) for (size,) in _BUFFER_LENGTH.iter_unpack(sizes)]
+        # The pickle and its out-of-band buffers are read together
+        self.pipe.readinto_all([payload, *buffers])
+        if self._schema_struct is not None:
+            return self.schema._make(self._schema_struct.unpack(payload))
+        return _pickle_loads(payload, buffers=buffers)
 
     """Two methods are offered to support tracking whether enqueued tasks have been fully processed by daemon consumer interpreters
     """
@@ -423,8 +819,22 @@ class SingleQueue(_ABSQueue):
         If a join() is currently blocking, it will resume when all items have been processed (meaning that a task_done() call was received for every item that had been put() into the queue).
 
         Raises a ValueError if called more times than there were items placed in the queue.
+
+        Counts are sent to the parent in batches: every 255 calls, when
+        there is no item left to get, when "get" has to wait for a new item,
+        and on "close". The parent may be blocked on "maxsize" waiting
+        for them, so they are never held back with the pipe empty.
         """
-        pass
+        self._pending_acks += 1
+        if self._pending_acks >= 255 or not (self.pipe._rbuf or self.pipe.select(0)):
+            self._flush_acks()
+
+    def _flush_acks(self):
+        # implicit binary protocol: an unsigned byte with the number
+        # of tasks done since the last one was sent (see "size")
+        if self._pending_acks:
+            self.pipe.send(bytes([self._pending_acks]))
+            self._pending_acks = 0
 
     @_parent_only
     def join(self):
@@ -432,11 +842,24 @@ class SingleQueue(_ABSQueue):
 
         The count of unfinished tasks goes up whenever an item is added to the queue. The count goes down whenever a consumer thread calls task_done() to indicate that the item was retrieved and all work on it is complete. When the count of unfinished tasks drops to zero, join() unblocks.
         """
-        pass
+        while self.size > 0:
+            # Sleeps until the other end posts "task done" counts
+            self.pipe.select(None)
 
-    def __del__(self):
+    def close(self):
+        """Releases this end of the queue, posting any "task done" counts not sent yet"""
+        if self.pipe.closed:
+            return
+        if getattr(self, "_pending_acks", 0):
+            self._flush_acks()
         self.pipe.close()
 
+    def __del__(self):
+        if not hasattr(self, "pipe"):
+            # __init__ failed before creating it
+            return
+        self.close()
+
 
 class _QueueReturnOpcodes:
     NOP = 0
@@ -449,7 +872,7 @@ class Queue(_ABSQueue):
     def __init__(self, size=None):
         self.size = size
         self._buffer = LockableBoard()
-        self._signal_pipe = _SimplexPipe()
+        self._signal_pipe = _SignalChannel()
         self._parent_interp = get_current()
         self._post_init()
 
@@ -471,7 +894,7 @@ class Queue(_ABSQueue):
         )
 
     def __getstate__(self):
-        ns = self.__dict__.copy()
+        ns = _unbound_state(self)
         del ns["_data"]
         return ns
 
@@ -480,30 +903,45 @@ class Queue(_ABSQueue):
         self._post_init()
 
     def _post_init(self):
-        self._data = deque(maxlen=self.size)
+        self._data = deque()
+        _bind_mode(self, self.mode)
 
     @_child_only
     def _child_post_init(self):
         ...
 
-    def _fetch(self):
+    def _fetch(self, timeout=0):
         """
         _inner function - must be called only from .get()
         """
 
         # FIXME: This code likely needs a lock -
         origin_pipe = self._signal_pipe
-        tmp = self._buffer.fetch_item()
-        if not tmp:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        delay = 0.0005
+        while True:
+            remaining = (
+                None if deadline is None else max(0, deadline - time.monotonic())
+            )
+            # A ready byte on the signaler pipe indicates an object had been
+            # posted on the board. Claiming it comes first, in a single read which
+            # only waits in the selector if no byte is pending: only the
+            # interpreter that got the byte goes on to fetch an object.
+            if not origin_pipe.read(1, timeout=remaining):
+                return
+            tmp = self._buffer.fetch_item()
+            if tmp:
+                break
             if self._buffer._items_closed_interpreters > 0:
+                # the byte was for an item that vanished with its interpreter
                 self._buffer._items_closed_interpreters -= 1
-                origin_pipe.read(1)
-            return
-        # Only the winner of the race to fetch object, consumes a ready byte on
-        # on signaler pipe. (Byte is there - indicating an object
-        # had been posted on the board - it is detected in the select
-        # inside the get method.
-        origin_pipe.read(1)
+                continue
+            # Not posted yet: leave the byte for the next try, or the next call
+            origin_pipe.write(b"\x01")
+            if remaining == 0:
+                return
+            time.sleep(delay if remaining is None else min(delay, remaining))
+            delay = min(delay * 2, 0.05)
         _, obj = tmp
         self._data.append(obj)
 
@@ -519,8 +957,7 @@ class Queue(_ABSQueue):
         #elif timeout is None:
             #timeout = _DEFAULT_BLOCKING_TIMEOUT
         try:
-            if self._signal_pipe.select(timeout=timeout):
-                self._fetch()
+            self._fetch(timeout)
         except TimeoutError:
             if block:
                 raise
@@ -536,8 +973,9 @@ class Queue(_ABSQueue):
             timeout = _DEFAULT_BLOCKING_TIMEOUT
         index, item = self._buffer.new_item(item)
         try:
-            self._signal_pipe.select_for_write(timeout=timeout)
-            self._signal_pipe.write(b"\x01")
+            # The signal is written straight away: the channel only
+            # waits for room if the write would block.
+            self._signal_pipe.write(b"\x01", timeout)
 
         except (ResourceBusyError, TimeoutError):
             del self._buffer[index]
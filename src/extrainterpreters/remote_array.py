@@ -1,6 +1,7 @@
 import gc
 import os
 import pickle
+import re
 import threading
 import time
 import sys
@@ -17,6 +18,7 @@ from .utils import (
     _atomic_byte_lock,
     DoubleField,
     Field,
+    RawField,
     StructBase,
     ResourceBusyError,
     guard_internal_use
@@ -34,8 +36,12 @@ class RemoteState:
 class RemoteHeader(StructBase):
     lock = Field(1)
     state = Field(1)
-    enter_count = Field(3)
-    exit_count = Field(3)
+    _pad = RawField(2)
+    # counters are aligned 32 bit integers, so that
+    # they can be atomically incremented without the lock:
+    enter_count = Field(4)
+    exit_count = Field(4)
+    _pad_end = RawField(4)
 
 
 class RemoteDataState:
@@ -46,6 +52,7 @@ class RemoteDataState:
 
 DEFAULT_TTL = 3600
 REMOTE_HEADER_SIZE = RemoteHeader._size
+_NEWLINE = re.compile(b"\n")
 
 
 # when a RemoteArray can't be destroyed in parent,
@@ -138,6 +145,7 @@ class RemoteArray:
         "_timestamp",
         "_ttl",
         "_internal",
+        "_remote_handle",
     )
 
     def __init__(self, *, size=None, payload=None, ttl=DEFAULT_TTL):
@@ -146,9 +154,10 @@ class RemoteArray:
             size = len(payload)
         self._size = size
         self._data = bytearray(size + REMOTE_HEADER_SIZE)
+        self._remote_handle = None
         if payload:
             # TBD: Temporary thing - we are allowing zero-copy buffers soon
-            self._data[REMOTE_HEADER_SIZE:] = payload
+            self._data[REMOTE_HEADER_SIZE : REMOTE_HEADER_SIZE + len(payload)] = payload
         # Keeping reference to a "normal" memoryview, so that ._data
         # can't be resized (and worse: repositioned) by the interpreter.
         # trying to do so will raise a BufferError
@@ -174,7 +183,17 @@ class RemoteArray:
             index += REMOTE_HEADER_SIZE
         return index
 
-    def __getitem__(self, index):
+    def _payload_view(self):
+        """A memoryview over the payload, bypassing the array lock and state checks
+
+        For owners that synchronize access to the data by other means,
+        such as the per-block locks in a LockableBoard.
+        Must be released before the array is closed.
+        """
+        self._check_readable()
+        return memoryview(self._data)[REMOTE_HEADER_SIZE : REMOTE_HEADER_SIZE + self._size]
+
+    def _check_readable(self):
         if not self._data_state in (
             RemoteDataState.read_only,
             RemoteDataState.read_write,
@@ -182,6 +201,9 @@ class RemoteArray:
             raise RuntimeError(
                 "Trying to read data from buffer that is not ready for use"
             )
+
+    def __getitem__(self, index):
+        self._check_readable()
         return self._data.__getitem__(self._convert_index(index))
 
     def __setitem__(self, index, value):
@@ -204,6 +226,7 @@ class RemoteArray:
                 f"TTL Exceeded trying to use buffer in sub-interpreter {get_current()}"
             )
         self._data = _remote_memory(*self._internal[:2])
+        self._remote_handle = None
         self._lock = self._internal[2]
         self._cursor = 0
         with self._lock:
@@ -221,7 +244,7 @@ class RemoteArray:
             ):
                 self._data = None
                 raise RuntimeError(f"Invalid state in buffer: {state}")
-            self.header.enter_count += 1
+            self._increment_counter(RemoteHeader.enter_count)
         return self
 
     def _enter_parent(self):
@@ -252,12 +275,16 @@ class RemoteArray:
         return iter(self.data)
 
     def read(self, n=None):
+        # Returns a memoryview rather than a copy: "pickle.load", the main
+        # reader, copies whatever it needs from it. The view must not be
+        # used after the array is closed.
         with self._lock:
             if n is None:
                 n = len(self) - self._cursor
             prev = self._cursor
             self._cursor += n
-            return self[prev : self._cursor]
+            self._check_readable()
+            return memoryview(self._data)[self._convert_index(slice(prev, self._cursor))]
 
     def write(self, content):
         with self._lock:
@@ -271,28 +298,49 @@ class RemoteArray:
 
     def readline(self):
         # needed by pickle.load
-        result = []
-        read = 0
         with self._lock:
-            cursor = self._cursor
-            while read != 0x0A:
-                if cursor >= len(self):
-                    break
-                result.append(read := self[cursor])
-                cursor += 1
-            self._cursor = self.cursor
-        return bytes(result)
+            self._check_readable()
+            start = REMOTE_HEADER_SIZE + self._cursor
+            end = REMOTE_HEADER_SIZE + self._size
+            if start >= end:
+                return b""
+            # "_data" may be a memoryview, which has no ".find":
+            # a regexp search works on any buffer, without copying it.
+            if match := _NEWLINE.search(self._data, start, end):
+                end = match.end()
+            self._cursor = end - REMOTE_HEADER_SIZE
+            return bytes(self._data[start:end])
 
     def seek(self, pos):
         self._cursor = pos
 
+    def reader(self, pos=0):
+        """Returns a file-like reader over the data, starting at "pos"
+
+        The reader has its own cursor, and does not take the array lock:
+        it is meant for a single "pickle.load" call, at a point where
+        nothing else writes to the array, and must not be used after
+        the array is closed.
+        """
+        return _ArrayReader(self, pos)
+
     def _data_for_remote(self):
         # TBD: adjust when spliting payload buffer from header buffer
         # return _address_and_size(self.data)
-        address, length = _address_and_size(self._data)
-        address += RemoteHeader._size
-        length -= RemoteHeader._size
-        return address, length
+
+        # "_data" can't be moved while this instance is alive (see "_anchor"),
+        # so its address is fetched once - and forgotten whenever "_data" changes.
+        if self._remote_handle is None:
+            address, length = _memoryboard._address_and_size(self._data)
+            address += RemoteHeader._size
+            length -= RemoteHeader._size
+            self._remote_handle = address, length
+        return self._remote_handle
+
+    def _increment_counter(self, field):
+        header_address = self._data_for_remote()[0] - REMOTE_HEADER_SIZE
+        # unguarded: this runs on every child enter and exit
+        _memoryboard._atomic_add_u32(header_address + field.offset, 1)
 
     def __getstate__(self):
         with self._lock:
@@ -327,6 +375,7 @@ class RemoteArray:
         # take place.
         self._lock = None  # state["_lock"]
         self._data = None
+        self._remote_handle = None
         self._cursor = 0
         self._mode = _InstMode.child
         self._data_state = RemoteDataState.not_ready
@@ -338,6 +387,7 @@ class RemoteArray:
         inst = type(self).__new__(type(self))
         inst._anchor = self._anchor
         inst._data = self._data
+        inst._remote_handle = None
         inst._mode = _InstMode.zombie
         inst._size = self._size
         inst._lock = self._lock
@@ -358,10 +408,10 @@ class RemoteArray:
         if self._mode == target_mode:
             if self._data is None:
                 return
-            with self._lock:
-                self.header.exit_count += 1
+            self._increment_counter(RemoteHeader.exit_count)
             self._data_state = RemoteDataState.not_ready
             self._data = None
+            self._remote_handle = None
             return
         with self._lock:
             early_stages = self.header.state in (
@@ -380,6 +430,7 @@ class RemoteArray:
             self._data_state = RemoteDataState.not_ready
             del self._anchor
             self._data = None
+            self._remote_handle = None
             return
         if self._mode == _InstMode.zombie:
             # do nothing on fail
@@ -387,6 +438,7 @@ class RemoteArray:
         self._copy_to_limbo()
         del self._anchor
         self._data = None
+        self._remote_handle = None
         del self._cursor
         self._data_state = RemoteDataState.not_ready
         # This instance is now a floating "casc" which can no longer access
@@ -407,3 +459,33 @@ class RemoteArray:
                 # may have been deleted
                 pass
 
+
+class _ArrayReader:
+    __slots__ = ("_view", "_cursor")
+
+    def __init__(self, array, pos=0):
+        array._check_readable()
+        self._view = memoryview(array._data)[
+            REMOTE_HEADER_SIZE : REMOTE_HEADER_SIZE + array._size
+        ]
+        self._cursor = pos
+
+    def read(self, n=-1):
+        start = self._cursor
+        size = len(self._view)
+        self._cursor = size if n is None or n < 0 else min(start + n, size)
+        return self._view[start : self._cursor]
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def readline(self):
+        start = self._cursor
+        match = _NEWLINE.search(self._view, start)
+        self._cursor = match.end() if match else len(self._view)
+        return bytes(self._view[start : self._cursor])
+
+    def tell(self):
+        return self._cursor
@@ -1,14 +1,39 @@
 import sys
 import pickle
 import time
+from functools import lru_cache, partial
 from pathlib import Path
 from textwrap import dedent as D
+from types import BuiltinFunctionType, FunctionType
 
 from . import BFSZ, interpreters
 from .memoryboard import ProcessBuffer
 from .base_interpreter import BaseInterpreter
 
 
+# Calls cross into the sub-interpreter in the newest pickle protocol:
+# both ends always run the same Python.
+_dumps = partial(pickle.dumps, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+@lru_cache(maxsize=256)
+def _pickle_by_reference(func):
+    return _dumps(func)
+
+
+def _pickle_callable(func):
+    """Pickles the target of a call
+
+    Functions and classes are pickled by reference (module and name),
+    so their pickled bytes are computed once and reused on
+    repeated calls. Other callables carry state, and are
+    pickled each time.
+    """
+    if isinstance(func, (FunctionType, BuiltinFunctionType, type)):
+        return _pickle_by_reference(func)
+    return _dumps(func)
+
+
 class _BufferedInterpreter(BaseInterpreter):
     """Internal class holding methods to be used
     as building blocks for the final classes
@@ -41,10 +66,10 @@ class _BufferedInterpreter(BaseInterpreter):
             _m.__enter__()
 
             def _thaw(ind_data):
-                _m.seek(ind_data)
-                func = pickle.load(_m)
-                args = pickle.load(_m)
-                kw = pickle.load(_m)
+                reader = _m.reader(ind_data)
+                func = pickle.load(reader)
+                args = pickle.load(reader)
+                kw = pickle.load(reader)
                 return func, args, kw
 
             def _call(ind_data):
@@ -78,8 +103,7 @@ class _BufferedInterpreter(BaseInterpreter):
             )
         if hasattr(self, "_cached_result"):
             return self._cached_result
-        self.map.seek(self.buffer.nranges["return_data"])
-        result = pickle.load(self.map)
+        result = pickle.load(self.map.reader(self.buffer.nranges["return_data"]))
         if self.thread:
             self.thread.join()
             self.thread = None
@@ -187,9 +211,9 @@ class SimpleInterpreter(_BufferedInterpreter):
 
         self.map.seek(self.buffer.nranges["send_data"])
         _failed = False
-        for obj in (func, args, kwargs):
+        for data in (_pickle_callable(func), _dumps(args), _dumps(kwargs)):
             try:
-                pickle.dump(obj, self.map)
+                self.map.write(data)
             except ValueError:
                 _failed = True
             if _failed or self.map.tell() >= self.buffer.range_sizes["send_data"]:
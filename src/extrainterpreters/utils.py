@@ -1,5 +1,6 @@
 import struct
 import sys
+from collections import namedtuple
 from functools import wraps
 
 
@@ -31,43 +32,52 @@ def guard_internal_use(func):
     return wrapper
 
 
-from ._memoryboard import _remote_memory, _address_and_size, _atomic_byte_lock
+from ._memoryboard import (
+    _remote_memory,
+    _address_and_size,
+    _atomic_byte_lock,
+    _atomic_byte_lock_timed,
+    _atomic_byte_unlock,
+    _atomic_add_u32,
+    _find_and_lock_block,
+    _reset_blocks,
+    _count_blocks,
+)
 
 _remote_memory = guard_internal_use(_remote_memory)
 _address_and_size = guard_internal_use(_address_and_size)
 _atomic_byte_lock = guard_internal_use(_atomic_byte_lock)
+_atomic_byte_lock_timed = guard_internal_use(_atomic_byte_lock_timed)
+_atomic_byte_unlock = guard_internal_use(_atomic_byte_unlock)
+_atomic_add_u32 = guard_internal_use(_atomic_add_u32)
+_find_and_lock_block = guard_internal_use(_find_and_lock_block)
+_reset_blocks = guard_internal_use(_reset_blocks)
+_count_blocks = guard_internal_use(_count_blocks)
 
 
-class clsproperty:
-    def __init__(self, method):
-        self.method = method
+class RawField:
+    def __init__(self, bytesize):
+        self.size = bytesize
 
     def __set_name__(self, owner, name):
+        # "offset" is set by the owner class, in StructBase.__init_subclass__
         self.name = name
 
-    def __get__(self, intance, owner):
-        return self.method(owner)
+    def _format(self):
+        # format code for this field in the "struct" module
+        if self.name.startswith("_"):
+            return f"{self.size}x"
+        return f"{self.size}s"
 
-    def __repr__(self):
-        return f"clsproperty <{self.name}>"
+    def _slice_source(self):
+        return f"base + {self.offset} : base + {self.offset + self.size}"
 
+    def _read_source(self):
+        # expression reading this field from "data" for a struct at "base"
+        return f"data[{self._slice_source()}]"
 
-class RawField:
-    def __init__(self, bytesize):
-        self.size = bytesize
-
-    def _calc_offset(self, owner):
-        offset = 0
-        for name, obj in owner.__dict__.items():
-            if not isinstance(obj, RawField):
-                continue
-            if obj is self:
-                return offset
-            offset += obj.size
-
-    def __set_name__(self, owner, name):
-        self.offset = self._calc_offset(owner)
-        self.name = name
+    def _write_source(self):
+        return f"data[{self._slice_source()}] = value"
 
     def __get__(self, instance, owner):
         if instance is None:
@@ -81,32 +91,84 @@ class RawField:
 
 
 class Field(RawField):  # int field
+    _int_formats = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
+    def _format(self):
+        if self.name.startswith("_"):
+            return super()._format()
+        # Other sizes have no "struct" format code:
+        return self._int_formats.get(self.size)
+
+    def _read_source(self):
+        if self.size == 1:
+            return f"data[base + {self.offset}]"
+        return f"int.from_bytes({super()._read_source()}, 'little')"
+
+    def _write_source(self):
+        if self.size == 1:
+            return f"data[base + {self.offset}] = value"
+        return f"data[{self._slice_source()}] = value.to_bytes({self.size}, 'little')"
+
+    def __set_name__(self, owner, name):
+        super().__set_name__(owner, name)
+        # precompiled: reads and writes need no slice of the buffer
+        format = self._int_formats.get(self.size)
+        self._packer = struct.Struct("<" + format) if format else None
+
     def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        if instance._has_buffer and self._packer is not None:
+            return self._packer.unpack_from(
+                instance._data, instance._offset + self.offset
+            )[0]
         value = super().__get__(instance, owner)
         if not isinstance(value, (bytes, bytearray, memoryview)):
             return value
         return int.from_bytes(value, "little")
 
     def __set__(self, instance, value):
+        if instance._has_buffer and self._packer is not None:
+            try:
+                self._packer.pack_into(
+                    instance._data, instance._offset + self.offset, value
+                )
+            except struct.error as error:
+                # the same error "int.to_bytes" raises for out of range values
+                raise OverflowError(str(error)) from None
+            return
         value = value.to_bytes(self.size, "little")
         super().__set__(instance, value)
 
 
+_DOUBLE = struct.Struct("d")
+
+
+def _has_buffer(data):
+    return hasattr(type(data), "__buffer__")
+
+
 class DoubleField(RawField):
     def __init__(self):
         super().__init__(8)
 
+    def _format(self):
+        return "d"
+
+    def _read_source(self):
+        return f"_DOUBLE.unpack({super()._read_source()})[0]"
+
+    def _write_source(self):
+        return f"data[{self._slice_source()}] = _DOUBLE.pack(value)"
+
     def __get__(self, instance, owner):
         value = super().__get__(instance, owner)
         if not isinstance(value, (bytes, bytearray)):
             return value
-        return struct.unpack(
-            "d",
-            value,
-        )[0]
+        return _DOUBLE.unpack(value)[0]
 
     def __set__(self, instance, value):
-        value = struct.pack("d", value)
+        value = _DOUBLE.pack(value)
         super().__set__(instance, value)
 
 
@@ -121,6 +183,58 @@ class StructBase:
 
     slots = ("_data", "_offset")
 
+    # fields named with a leading "_" are padding:
+    # they take up space, but hold no data.
+    _fields = ()
+    _size = 0
+    # whether "_data" exposes the buffer protocol: set whenever "_data"
+    # is, so that field accessors need not probe it on each access.
+    _has_buffer = True
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # The layout is fixed when the class is created: field offsets,
+        # the names of data fields and the total size are computed once.
+        offset = 0
+        fields = []
+        for name, obj in cls.__dict__.items():
+            if not isinstance(obj, RawField):
+                continue
+            obj.offset = offset
+            offset += obj.size
+            if not name.startswith("_"):
+                fields.append(name)
+        cls._fields = tuple(fields)
+        cls._size = offset
+        # A precompiled struct reads or writes all fields at once,
+        # for structs whose fields all have a format code.
+        formats = [
+            obj._format() for obj in cls.__dict__.values() if isinstance(obj, RawField)
+        ]
+        cls._struct = None if None in formats else struct.Struct("<" + "".join(formats))
+        cls._tuple = namedtuple(cls.__name__ + "Values", cls._fields)
+        cls._build_accessors()
+
+    @classmethod
+    def _build_accessors(cls):
+        # Creates "_read_<field>(data, base)" and "_write_<field>(data, base, value)"
+        # functions for each field, with offsets and sizes inlined:
+        # they skip the descriptors, and the need for a struct instance.
+        source = []
+        for name in cls._fields:
+            field = cls.__dict__[name]
+            source.append(
+                f"def _read_{name}(data, base=0):\n"
+                f"    return {field._read_source()}\n"
+                f"def _write_{name}(data, base, value):\n"
+                f"    {field._write_source()}\n"
+            )
+        namespace = {"_DOUBLE": _DOUBLE}
+        exec(compile("".join(source), f"<{cls.__name__} accessors>", "exec"), namespace)
+        for name in cls._fields:
+            for prefix in ("_read_", "_write_"):
+                setattr(cls, prefix + name, staticmethod(namespace[prefix + name]))
+
     def __init__(self, **kwargs):
         self._offset = 0
         self._data = bytearray(self._size)
@@ -136,34 +250,51 @@ class StructBase:
         self = cls.__new__(cls)
         self._data = _data
         self._offset = _offset
+        self._has_buffer = _has_buffer(_data)
         return self
 
-    @clsproperty
-    def _fields(cls):
-        for k, v in cls.__dict__.items():
-            if isinstance(v, RawField):
-                yield k
+    @property
+    def _values(self):
+        """All field values, as a named tuple"""
+        if self._struct is None:
+            return self._tuple._make(getattr(self, name) for name in self._fields)
+        if self._has_buffer:
+            return self._read_values(self._data, self._offset)
+        return self._tuple._make(self._struct.unpack(self._bytes))
+
+    @classmethod
+    def _read_values(cls, data, base=0):
+        """All field values of the struct at "base" in "data", with a single unpack
+
+        Only for structs with a precompiled "_struct".
+        """
+        return cls._tuple._make(cls._struct.unpack_from(data, base))
+
+    def _set_values(self, *values):
+        """Write all fields at once, given their values in order"""
+        if self._struct is None:
+            for name, value in zip(self._fields, values, strict=True):
+                setattr(self, name, value)
+            return
+        try:
+            packed = self._struct.pack(*values)
+        except struct.error as error:
+            raise OverflowError(str(error)) from None
+        self._data[self._offset : self._offset + self._size] = packed
 
     @property
     def _bytes(self):
         return bytes(self._data[self._offset : self._offset + self._size])
 
-    @clsproperty
-    def _size(cls):
-        size = 0
-        for name, obj in cls.__dict__.items():
-            if isinstance(obj, RawField):
-                size += obj.size
-        return size
-
     def _detach(self):
         self._data = self._data[self._offset : self._offset + self._size]
         self._offset = 0
+        self._has_buffer = _has_buffer(self._data)
 
     @classmethod
     def _get_offset_for_field(cls, field_name):
-        field = getattr(cls, field_name)
-        return field._calc_offset(cls)
+        # offsets are computed once, when the class body is created:
+        return getattr(cls, field_name).offset
 
     def _push_to(self, data, offset=0):
         """Paste struct data into a new buffer given by data, offset
@@ -1,4 +1,5 @@
 import time
+from typing import NamedTuple
 
 # uncomment the next line to witness general mayhen:
 # import pytest
@@ -21,6 +22,12 @@ def big_return_payload():
     return b"\x00" * 2_000_001
 
 
+class Point(NamedTuple):
+    x: int
+    y: float
+    visible: bool
+
+
 class RemoteClass:
     def __init__(self):
         pass
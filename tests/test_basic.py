@@ -4,7 +4,7 @@ from pathlib import Path
 import pytest
 
 import extrainterpreters
-from extrainterpreters import interpreters, raw_list_all
+from extrainterpreters import interpreters, raw_list_all, cached_interp_set
 
 
 def test_running_plain_call_works():
@@ -22,6 +22,34 @@ def test_interpreter_is_destroyed_after_context_exits():
     assert intno not in raw_list_all()
 
 
+def test_get_current_is_cached_per_interpreter():
+    assert extrainterpreters.get_current() == 0
+    with extrainterpreters.Interpreter() as interp:
+        assert interp.run(extrainterpreters.get_current) == int(interp.intno)
+        assert interp.run(extrainterpreters.get_current) == int(interp.intno)
+    assert extrainterpreters.get_current() == 0
+
+
+def test_cached_interp_set_follows_interpreter_lifetime():
+    assert 0 in cached_interp_set()
+    with extrainterpreters.Interpreter() as interp:
+        intno = int(interp.intno)
+        assert intno in cached_interp_set(ttl=60)
+
+    assert intno not in cached_interp_set(ttl=60)
+
+
+def test_cached_interp_set_is_invalidated_in_other_interpreters():
+    with extrainterpreters.Interpreter() as interp:
+        interp.run_string(
+            "import extrainterpreters; extrainterpreters.cached_interp_set()"
+        )
+        with extrainterpreters.Interpreter() as other:
+            intno = int(other.intno)
+            assert interp.run(extrainterpreters.cached_interp_set, 60) >= {0, intno}
+        assert intno not in interp.run(extrainterpreters.cached_interp_set, 60)
+
+
 def test_extrainterpreters_list_all():
     with extrainterpreters.Interpreter() as interp:
         intno = interp.intno
@@ -165,3 +193,17 @@ def test_interpreter_run_can_call_callable(add_current_path):
         while not interp.done():
             time.sleep(time_res)
     assert interp.result() == 23
+
+
+def test_callable_is_pickled_once_by_reference(add_current_path):
+    import helper_01
+    from extrainterpreters.simple_interpreter import _pickle_callable
+
+    func = helper_01.to_run_remotely
+    assert _pickle_callable(func) is _pickle_callable(func)
+    inst = helper_01.RemoteClass()
+    assert _pickle_callable(inst) is not _pickle_callable(inst)
+
+    with extrainterpreters.Interpreter() as interp:
+        assert interp.run(func) == 42
+        assert interp.run(func) == 42
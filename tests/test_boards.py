@@ -214,3 +214,262 @@ def test_memoryboard_fetch_from_gone_interpreter_doesnot_crash(lowlevel):
     )
     interp.close()
     assert board.fetch_item() is None
+
+
+def test_memoryboard_fetch_ignores_stale_interpreter_cache(lowlevel, monkeypatch):
+    interp = ei.Interpreter().start()
+    intno = int(interp.intno)
+    board = LockableBoard()
+    interp.run_string(
+        D(
+            f"""\
+        import extrainterpreters; extrainterpreters.DEBUG = True
+        board = pickle.loads({pickle.dumps(board)})
+        board.new_item(b"x" * 1000)
+    """
+        )
+    )
+    generation = ei._memoryboard._interp_generation()
+    interp.close()
+    # as seen by an interpreter whose cache predates the close:
+    monkeypatch.setattr(
+        ei, "_interp_set_cache", (time.monotonic(), generation, frozenset((0, intno)))
+    )
+    assert board.fetch_item() is None
+
+
+def test_lockableboard_item_with_out_of_band_buffers(lowlevel):
+    board = LockableBoard()
+    size = board.collect()
+    data = bytearray(b"\x01\x02\x03" * 1000)
+    index, control = board.new_item({"a": pickle.PickleBuffer(data), "b": 42})
+    assert control.content_type == memoryboard.ContentType.pickled_oob
+    # writable buffers are copied into the item payload itself
+    assert len(board.blocks[index]) == 1
+
+    board2 = pickle.loads(pickle.dumps(board))
+    index, new_obj = board2.fetch_item()
+    assert new_obj == {"a": data, "b": 42}
+    assert new_obj["a"] is not data
+    assert board.collect() == size
+
+
+def test_lockable_board_shares_readonly_out_of_band_buffers_in_place(lowlevel):
+    board = LockableBoard()
+    size = board.collect()
+    data = b"\x01\x02\x03" * 1000
+    index, control = board.new_item([pickle.PickleBuffer(data)])
+    anchors = board.blocks[index][1:]
+    assert anchors[0].raw().obj is data
+
+    board2 = pickle.loads(pickle.dumps(board))
+    index, new_obj = board2.fetch_item()
+    assert bytes(new_obj[0]) == data
+    assert board.collect() == size
+
+
+def test_blocklock_size_is_a_power_of_two():
+    size = memoryboard.BlockLock._size
+    assert size & (size - 1) == 0
+
+
+def test_remotearray_remote_handle_is_reset_on_close(lowlevel):
+    buffer = RemoteArray(size=64)
+    with buffer:
+        handle = buffer._data_for_remote()
+        assert buffer._data_for_remote() is handle
+        assert handle[1] == 64
+    assert buffer._remote_handle is None
+
+
+def test_lockableboard_reuses_blocks_freed_elsewhere(lowlevel):
+    board = LockableBoard(size=4)
+    indexes = [board.new_item(i)[0] for i in range(4)]
+    assert indexes == [0, 1, 2, 3]
+    assert not board._free_blocks
+    with pytest.raises(ValueError):
+        board.new_item(4)
+
+    # fetching in a board counterpart marks the block as garbage,
+    # without the original board knowing:
+    board2 = pickle.loads(pickle.dumps(board))
+    index, item = board2.fetch_item()
+    assert board.new_item(5)[0] == index
+
+    del board[1]
+    assert board._free_blocks == [1]
+    assert board.new_item(6)[0] == 1
+
+
+def test_lockableboard_slow_path_scan_is_next_fit(lowlevel):
+    board = LockableBoard(size=4)
+    for i in range(4):
+        board.new_item(i)
+    board2 = pickle.loads(pickle.dumps(board))
+    for i in range(3):
+        board2.fetch_item()
+    # blocks 0, 1 and 2 were freed elsewhere: found in order, not always 0
+    assert [board.new_item(i)[0] for i in range(3)] == [0, 1, 2]
+    for i in range(4):
+        board2.fetch_item()
+    # all blocks are free: resumes at block 3, then wraps around to block 0
+    assert [board.new_item(i)[0] for i in range(2)] == [3, 0]
+
+
+def test_remotearray_read_returns_views_usable_by_pickle():
+    payload = pickle.dumps({"a": b"x" * 1000, "b": 42})
+    with RemoteArray(payload=payload) as buffer:
+        chunk = buffer.read(4)
+        assert isinstance(chunk, memoryview)
+        assert chunk == payload[:4]
+        buffer.seek(0)
+        assert pickle.load(buffer) == {"a": b"x" * 1000, "b": 42}
+
+
+def test_remotearray_readline():
+    with RemoteArray(payload=b"first\nsecond\nlast") as buffer:
+        assert buffer.readline() == b"first\n"
+        assert buffer.readline() == b"second\n"
+        assert buffer.readline() == b"last"
+        assert buffer.readline() == b""
+        assert buffer.tell() == len(buffer)
+
+
+def test_lockableboard_states_and_locks_are_contiguous_columns(lowlevel):
+    board = LockableBoard(size=8)
+    for i in range(3):
+        board.new_item(i)
+    ready = memoryboard.State.ready
+    assert bytes(board.map[0:8]) == bytes([ready, ready, ready, 0, 0, 0, 0, 0])
+    assert bytes(board.map[8:16]) == bytes(8)
+    assert board[2].content_type == memoryboard.ContentType.int64
+
+
+def test_lockableboard_metadata_records_are_cache_line_aligned(lowlevel):
+    board = LockableBoard(size=8)
+    assert memoryboard.BlockLock._size == memoryboard.CACHE_LINE
+    for index in range(8):
+        offset = board[index]._offset
+        assert (board._address + offset) % memoryboard.CACHE_LINE == 0
+        assert offset + memoryboard.BlockLock._size <= len(board.map)
+
+
+def test_remotearray_reader_has_its_own_cursor():
+    first, second = pickle.dumps([1, 2]), pickle.dumps("second\nline")
+    with RemoteArray(payload=first + second) as buffer:
+        reader = buffer.reader()
+        assert pickle.load(reader) == [1, 2]
+        assert pickle.load(reader) == "second\nline"
+        assert buffer.tell() == 0
+        assert pickle.load(buffer.reader(len(first))) == "second\nline"
+
+
+def test_processbuffer_range_sizes():
+    buffer = memoryboard.ProcessBuffer(10_000)
+    assert buffer.range_sizes == {
+        "command_area": 4096,
+        "send_data": 8000 - 4096,
+        "return_data": 2000,
+    }
+    buffer.close()
+    with pytest.raises(ValueError):
+        memoryboard.ProcessBuffer(100, {0: "a", 50: "b", 20: "c"})
+
+
+def test_lockableboard_reuses_payload_buffers(lowlevel):
+    board = LockableBoard(size=4)
+    index, _ = board.new_item("x" * 300)
+    payload_buffer = board.blocks[index][0]
+    assert len(payload_buffer.map) == 512
+
+    board2 = pickle.loads(pickle.dumps(board))
+    assert board2.fetch_item()[1] == "x" * 300
+    board.collect()
+    assert board._payload_pool[512] == [payload_buffer]
+
+    index, _ = board.new_item("y" * 400)
+    assert board.blocks[index][0] is payload_buffer
+    assert board2.fetch_item()[1] == "y" * 400
+
+
+def test_lockableboard_full_board_returns_payload_buffer_to_pool(lowlevel):
+    board = LockableBoard(size=1)
+    board.new_item("x" * 300)
+    with pytest.raises(ValueError):
+        board.new_item("y" * 300)
+    assert len(board._payload_pool[512]) == 1
+    with pytest.raises(ValueError):
+        board.new_item("z" * 300)
+    assert len(board._payload_pool[512]) == 1
+
+
+@pytest.mark.parametrize(
+    ["value", "content_type"],
+    [
+        (42, memoryboard.ContentType.int64),
+        (-(1 << 63), memoryboard.ContentType.int64),
+        (1 << 63, memoryboard.ContentType.pickled),
+        (True, memoryboard.ContentType.boolean),
+        (False, memoryboard.ContentType.boolean),
+        (None, memoryboard.ContentType.none),
+        (0.25, memoryboard.ContentType.float64),
+        (b"\x00data", memoryboard.ContentType.raw_bytes),
+        (b"", memoryboard.ContentType.raw_bytes),
+        (b"x" * 1000, memoryboard.ContentType.raw_bytes),
+        (bytearray(b"x" * 1000), memoryboard.ContentType.raw_bytearray),
+        (bytearray(), memoryboard.ContentType.raw_bytearray),
+        (memoryview(b"x" * 1000), memoryboard.ContentType.raw_memoryview),
+        (memoryview(b"\x01\x02"), memoryboard.ContentType.raw_memoryview),
+        (
+            memoryview(bytearray(range(24))).cast("i", (3, 2)),
+            memoryboard.ContentType.raw_memoryview,
+        ),
+        ("text", memoryboard.ContentType.text),
+        ("\udc80 surrogate and ção" * 10, memoryboard.ContentType.text),
+        ([1, 2], memoryboard.ContentType.pickled),
+    ],
+)
+def test_lockableboard_plain_values(lowlevel, value, content_type):
+    board = LockableBoard(size=4)
+    index, control = board.new_item(value)
+    assert control.content_type == content_type
+    board2 = pickle.loads(pickle.dumps(board))
+    index, item = board2.fetch_item()
+    assert item == value and type(item) is type(value)
+
+
+def test_lockableboard_interpreters_allocate_from_their_own_shard(lowlevel, monkeypatch):
+    board = LockableBoard()
+    assert board.new_item(1)[0] == 0
+
+    monkeypatch.setattr(memoryboard, "get_current", lambda: 3)
+    board2 = pickle.loads(pickle.dumps(board))
+    shard_size = LockableBoard.maxblocks // memoryboard.BOARD_SHARDS
+    assert board2.new_item(2)[0] == 3 * shard_size
+    assert board2.new_item(3)[0] == 3 * shard_size + 1
+    # blocks before the shard are the last to be tried
+    assert board2._free_blocks[0] == 3 * shard_size - 1
+
+
+def test_lockableboard_view_is_released_on_close(lowlevel):
+    board = LockableBoard(size=4)
+    view = board._view
+    board.new_item(1)
+    assert view[0] == memoryboard.State.ready
+    board.close()
+    assert board._view is None
+    with pytest.raises(ValueError):
+        view[0]
+
+
+def test_lockableboard_small_payloads_are_stored_inline(lowlevel):
+    board = LockableBoard(size=4)
+    index, control = board.new_item("small")
+    assert control.content_address == 0
+    assert index not in board.blocks
+    index2, control2 = board.new_item("large" * 10)
+    assert control2.content_address != 0
+    assert index2 in board.blocks
+    board2 = pickle.loads(pickle.dumps(board))
+    assert board2.fetch_item() == (index, "small")
+    assert board2.fetch_item() == (index2, "large" * 10)
@@ -1,3 +1,4 @@
+import os
 import sys
 from pathlib import Path
 from functools import partial
@@ -5,6 +6,7 @@ from functools import partial
 import pytest
 
 from extrainterpreters import memoryboard
+from extrainterpreters import utils
 
 
 @pytest.mark.parametrize(
@@ -13,6 +15,12 @@ from extrainterpreters import memoryboard
         memoryboard._address_and_size,
         memoryboard._remote_memory,
         memoryboard._atomic_byte_lock,
+        utils._atomic_byte_lock_timed,
+        utils._atomic_byte_unlock,
+        utils._atomic_add_u32,
+        utils._find_and_lock_block,
+        utils._reset_blocks,
+        utils._count_blocks,
     ],
 )
 def test_lowlevel_func_guarded_from_out_of_package_call(func):
@@ -67,8 +75,24 @@ def test_atomiclock_works_only_when_indicator_at_0(lowlevel):
     assert memoryboard._atomic_byte_lock(address)
     assert buffer[0] == 1
     assert not memoryboard._atomic_byte_lock(address)
+    # a failed attempt leaves the byte untouched
+    assert buffer[0] == 1
     buffer[0] = 2
     assert not memoryboard._atomic_byte_lock(address)
+    assert buffer[0] == 2
+    utils._atomic_byte_unlock(address)
+    assert buffer[0] == 0
+    assert memoryboard._atomic_byte_lock(address)
+
+
+def test_atomic_byte_lock_with_spins(lowlevel):
+    buffer = bytearray([1])
+    address, _ = memoryboard._address_and_size(buffer)
+    assert not memoryboard._atomic_byte_lock(address, 100)
+    assert buffer[0] == 1
+    buffer[0] = 0
+    assert memoryboard._atomic_byte_lock(address, 100)
+    assert buffer[0] == 1
 
 
 def test_atomiclock_locks(lowlevel):
@@ -95,3 +119,148 @@ def test_atomiclock_locks(lowlevel):
     [t.start() for t in threads]
     [t.join() for t in threads]
     assert counter == 20
+
+
+def test_atomiclock_timed_waits_for_release(lowlevel):
+    import time, threading
+
+    buffer = bytearray([1])
+    address, _ = memoryboard._address_and_size(buffer)
+    start = time.monotonic()
+    assert not utils._atomic_byte_lock_timed(address, 0.02, 40, 1_000, 1_000_000)
+    assert time.monotonic() - start >= 0.02
+
+    def release():
+        time.sleep(0.02)
+        buffer[0] = 0
+
+    thread = threading.Thread(target=release)
+    thread.start()
+    assert utils._atomic_byte_lock_timed(address, 1, 40, 1_000, 1_000_000)
+    assert buffer[0]
+    thread.join()
+
+
+def test_atomiclock_timed_woken_by_unlock(lowlevel):
+    import time, threading
+
+    buffer = bytearray([1])
+    address, _ = memoryboard._address_and_size(buffer)
+
+    def release():
+        time.sleep(0.05)
+        utils._atomic_byte_unlock(address)
+
+    thread = threading.Thread(target=release)
+    thread.start()
+    start = time.monotonic()
+    # Rechecks only every 5 seconds: unlocking must wake the waiter
+    assert utils._atomic_byte_lock_timed(address, 10, 40, 5_000_000_000, 5_000_000_000)
+    assert time.monotonic() - start < 2
+    thread.join()
+    utils._atomic_byte_unlock(address)
+    assert buffer[0] == 0
+
+
+def test_find_and_count_blocks(lowlevel):
+    # 4 records of 4 bytes: state, lock, 2 bytes of payload
+    buffer = bytearray([2, 0, 9, 9,  0, 1, 9, 9,  5, 0, 9, 9,  0, 0, 9, 9])
+    address, _ = memoryboard._address_and_size(buffer)
+    free = 1 << 0 | 1 << 5
+    assert utils._count_blocks(address, 4, 4, 1 << 0) == 2
+    assert utils._count_blocks(address, 4, 4, free) == 3
+
+    assert utils._find_and_lock_block(address, 3, 4, 3, free, 1) == -1
+    assert utils._find_and_lock_block(address, 4, 4, 0, free, 1) == 2
+    assert buffer[9] == 1
+    assert utils._find_and_lock_block(address, 4, 4, 0, free, 1) == 3
+    assert buffer[13] == 1
+    assert utils._find_and_lock_block(address, 4, 4, 0, free, 1) == -1
+    assert utils._find_and_lock_block(address, 4, 4, 0, 1 << 2, 1) == 0
+
+
+def test_find_and_lock_block_in_separate_columns(lowlevel):
+    # 4 state bytes, followed by 4 lock bytes
+    buffer = bytearray([2, 0, 5, 0,  0, 1, 0, 0])
+    address, _ = memoryboard._address_and_size(buffer)
+    free = 1 << 0 | 1 << 5
+    assert utils._count_blocks(address, 4, 1, free) == 3
+    assert utils._find_and_lock_block(address, 4, 1, 0, free, 4) == 2
+    assert buffer[6] == 1
+    assert utils._find_and_lock_block(address, 4, 1, 0, free, 4) == 3
+    assert utils._find_and_lock_block(address, 4, 1, 0, free, 4) == -1
+
+
+def test_find_and_lock_block_tries_only_flagged_records_in_word(lowlevel):
+    # 8 state bytes, followed by 8 lock bytes: one word in each column
+    states = [2, 5, 2, 0, 2, 2, 5, 2]
+    locks = [0, 1, 0, 1, 0, 0, 0, 0]
+    buffer = bytearray(states + locks)
+    address, _ = memoryboard._address_and_size(buffer)
+    free = 1 << 0 | 1 << 5
+    assert utils._find_and_lock_block(address, 8, 1, 0, free, 8) == 6
+    assert list(buffer[8:]) == [0, 1, 0, 1, 0, 0, 1, 0]
+    assert utils._find_and_lock_block(address, 8, 1, 0, free, 8) == -1
+
+
+def test_reset_blocks(lowlevel):
+    # 10 state bytes, followed by 10 lock bytes
+    states = [5, 0, 5, 2, 5, 5, 0, 0, 0, 5]
+    locks = [0, 0, 1, 0, 0, 0, 0, 0, 0, 0]
+    buffer = bytearray(states + locks)
+    address, _ = memoryboard._address_and_size(buffer)
+    assert utils._reset_blocks(address, 10, 1, 1 << 5, 10) == [0, 4, 5, 9]
+    assert list(buffer[:10]) == [0, 0, 5, 2, 0, 0, 0, 0, 0, 0]
+    assert list(buffer[10:]) == locks
+
+
+def test_block_scans_on_columns_match_byte_by_byte_scans(lowlevel):
+    import random
+
+    random.seed(42)
+    n = 37  # not a multiple of 8: exercises the tail after 8-byte words
+    states = [random.choice([0, 1, 2, 3, 5, 5, 5]) for _ in range(n)]
+    locks = [random.choice([0, 0, 1]) for _ in range(n)]
+    buffer = bytearray(states + locks)
+    address, _ = memoryboard._address_and_size(buffer)
+    for mask in (1 << 0, 1 << 2, 1 << 0 | 1 << 5, 1 << 4):
+        matching = [i for i, state in enumerate(states) if mask >> state & 1]
+        assert utils._count_blocks(address, n, 1, mask) == len(matching)
+
+    mask = 1 << 0 | 1 << 5
+    free = [i for i in range(n) if mask >> states[i] & 1 and not locks[i]]
+    for start in (0, 3, 9):
+        expected = [i for i in free if i >= start]
+        found = utils._find_and_lock_block(address, n, 1, start, mask, n)
+        assert found == (expected[0] if expected else -1)
+        if found >= 0:
+            assert buffer[n + found] == 1
+            free.remove(found)
+
+
+def test_atomic_add_u32(lowlevel):
+    buffer = bytearray(8)
+    address, _ = memoryboard._address_and_size(buffer)
+    assert utils._atomic_add_u32(address + 4, 1) == 0
+    assert utils._atomic_add_u32(address + 4, 2) == 1
+    assert int.from_bytes(buffer[4:], "little") == 3
+    assert buffer[:4] == bytearray(4)
+
+
+def test_fill_from_fd_reads_until_buffer_full_or_pipe_empty():
+    reader, writer = os.pipe()
+    os.set_blocking(reader, False)
+    buffer = bytearray(8)
+    os.write(writer, b"abc")
+    os.write(writer, b"de")
+    assert memoryboard._memoryboard._fill_from_fd(reader, buffer) == 5
+    assert buffer[:5] == b"abcde"
+    with pytest.raises(BlockingIOError):
+        memoryboard._memoryboard._fill_from_fd(reader, buffer)
+    os.write(writer, b"0123456789")
+    assert memoryboard._memoryboard._fill_from_fd(reader, buffer) == 8
+    assert buffer == b"01234567"
+    os.close(writer)
+    assert memoryboard._memoryboard._fill_from_fd(reader, buffer) == 2
+    assert memoryboard._memoryboard._fill_from_fd(reader, buffer) == 0
+    os.close(reader)
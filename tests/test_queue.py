@@ -1,7 +1,9 @@
+import gc
 import pickle
 import threading
 import time
 import os
+import weakref
 from textwrap import dedent as D
 
 
@@ -9,7 +11,7 @@ import extrainterpreters as ei
 from extrainterpreters import SingleQueue, Queue
 from extrainterpreters import get_current
 from extrainterpreters import Interpreter
-from extrainterpreters.queue import Empty, _SimplexPipe, _DuplexPipe
+from extrainterpreters.queue import Empty, Full, _SimplexPipe, _DuplexPipe, _EventCounter
 from extrainterpreters import resources
 
 import pytest
@@ -24,6 +26,85 @@ def test_simplexpipe_works():
     assert xx.read(2) == (b"\x03\x04")
 
 
+def test_pipe_readline_buffers_ahead():
+    xx = _SimplexPipe()
+    xx.write(b"first\nsecond\nlast")
+    assert xx.readline() == b"first\n"
+    assert xx.read(3) == b"sec"
+    assert xx.readline() == b"ond\n"
+    assert xx.readline() == b"last"
+    assert xx.readline() == b""
+
+
+def test_pipe_pickle_load_consecutive_objects():
+    xx = _SimplexPipe()
+    xx.write(pickle.dumps("a", protocol=0) + pickle.dumps([1, 2], protocol=0))
+    assert pickle.load(xx) == "a"
+    assert pickle.load(xx) == [1, 2]
+
+
+def test_pipe_read_with_stale_ready_flag_does_not_block():
+    xx = _SimplexPipe()
+    xx._read_ready_flag = True
+    assert xx.read(1) == b""
+    assert not xx._read_ready_flag
+    xx.write(b"\x01")
+    assert xx.select()
+    assert xx.read(1) == b"\x01"
+
+
+def test_pipe_nonblocking_read_skips_selector(monkeypatch):
+    xx = _SimplexPipe()
+    xx.write(b"\x01\x02")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("selector should not be used")
+
+    monkeypatch.setattr(resources.EISelector, "select", fail)
+    assert xx.read() == b"\x01\x02"
+    assert xx.read(1) == b""
+
+
+def test_pipe_waits_on_its_own_fd_without_selector(monkeypatch):
+    xx = _SimplexPipe()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("selector should not be used")
+
+    monkeypatch.setattr(resources.EISelector, "select", fail)
+    assert not xx.select(0.01)
+    threading.Timer(0.05, xx.write, args=(b"\x01",)).start()
+    assert xx.select(timeout=None)
+    assert xx.read(1) == b"\x01"
+    assert xx.select_for_write(0)
+
+
+def test_pipe_send_chunks_resumes_short_writes(monkeypatch):
+    xx = _SimplexPipe()
+    writev = os.writev
+    monkeypatch.setattr(os, "writev", lambda fd, chunks: writev(fd, [bytes(chunks[0][:3])]))
+    assert xx.send_chunks([b"ab", b"cdefg", memoryview(b"hij")]) == 10
+    assert xx.read() == b"abcdefghij"
+
+
+def test_pipe_send_chunks_takes_more_chunks_than_iov_max():
+    xx = _SimplexPipe()
+    chunks = [bytes([i % 256]) for i in range(3000)]
+    assert xx.send_chunks(chunks) == 3000
+    assert xx.read_exactly(3000) == b"".join(chunks)
+
+
+def test_pipe_send_times_out_on_full_pipe():
+    xx = _SimplexPipe()
+    with pytest.raises(BlockingIOError):
+        while True:
+            os.write(xx.writer_fd, b"\x00" * 4096)
+    with pytest.raises(TimeoutError):
+        xx.send(b"\x01", timeout=0.1)
+    xx.read(4096)
+    assert xx.send(b"\x01", timeout=0.1) == 1
+
+
 def test_simplexpipe_unpickles_with_same_memory_buffer_main_intrepreter():
     xx = _SimplexPipe()
     yy = pickle.loads(pickle.dumps(xx))
@@ -80,6 +161,25 @@ def test_simplexpipe_closes_fds_on_exit():
                 raise
 
 
+@pytest.mark.skipif(not hasattr(os, "eventfd"), reason="no eventfd in this platform")
+def test_event_counter_counts_signals():
+    xx = _EventCounter()
+    yy = pickle.loads(pickle.dumps(xx))
+    assert yy is xx
+    # more signals than would fit in a pipe buffer
+    for i in range(70_000):
+        xx.write(b"\x01")
+    assert xx.select()
+    assert xx.read(1) == b"\x01"
+    xx.write(b"\x01\x01")
+    assert sum(len(xx.read(1)) for i in range(70_003)) == 70_001
+    assert xx.read(1) == b""
+    fd = xx.reader_fd
+    xx.close()
+    with pytest.raises(OSError):
+        os.eventfd_read(fd)
+
+
 def test_simplexpipe_doesnotclose_when_open_in_other_interpreter():
     TOTAL = 5
     aa = _SimplexPipe()
@@ -152,12 +252,269 @@ def test_singlequeue_is_unpickled_as_counterpart_and_comunicates(lowlevel):
     interp.close()
 
 
+def test_pipe_read_exactly_joins_partial_reads():
+    xx = _SimplexPipe()
+    xx.write(b"abc")
+    xx.write(b"def")
+    assert xx.read_exactly(5) == b"abcde"
+    assert xx.read(1) == b"f"
+
+
+def test_pipe_readinto_all_fills_buffers_in_order():
+    xx = _SimplexPipe()
+    xx.write(b"head\nabcdefgh")
+    assert xx.readline() == b"head\n"
+    first, empty, second = bytearray(3), bytearray(), bytearray(5)
+    assert xx.readinto_all([first, empty, second]) == [first, empty, second]
+    assert first == b"abc" and second == b"defgh"
+
+
+def test_singlequeue_sends_several_items_at_once(lowlevel):
+    interp = Interpreter().start()
+    interp.run_string("import pickle")
+    aa = SingleQueue()
+    interp.run_string("import extrainterpreters; extrainterpreters.DEBUG = True")
+    interp.run_string(f"bb = pickle.loads({pickle.dumps(aa)})")
+    aa.put("x" * 10_000)
+    aa.put([1, 2])
+    interp.run_string("cc = bb.get(); dd = bb.get()")
+    interp.run_string("assert cc == 'x' * 10_000 and dd == [1, 2]")
+    interp.close()
+
+
+def test_singlequeue_sends_buffers_out_of_band(lowlevel):
+    interp = Interpreter().start()
+    interp.run_string("import pickle")
+    aa = SingleQueue()
+    interp.run_string("import extrainterpreters; extrainterpreters.DEBUG = True")
+    interp.run_string(f"bb = pickle.loads({pickle.dumps(aa)})")
+    aa.put({"a": bytearray(b"abc" * 5000), "b": pickle.PickleBuffer(b"xyz")})
+    interp.run_string("cc = bb.get()")
+    interp.run_string("assert cc['a'] == bytearray(b'abc' * 5000)")
+    interp.run_string("assert bytes(cc['b']) == b'xyz'")
+    interp.close()
+
+
+def test_singlequeue_sends_schema_items_without_pickle(lowlevel):
+    from helper_01 import Point
+
+    interp = Interpreter().start()
+    tests_path = os.path.dirname(__file__)
+    interp.run_string(f"import sys, pickle; sys.path.insert(0, {tests_path!r})")
+    aa = SingleQueue(schema=Point)
+    interp.run_string("import extrainterpreters; extrainterpreters.DEBUG = True")
+    interp.run_string(f"bb = pickle.loads({pickle.dumps(aa)})")
+    aa.put(Point(1, 2.5, True))
+    aa.put((-3, 0.0, False))
+    interp.run_string("cc = bb.get(); dd = bb.get()")
+    interp.run_string("assert type(cc).__name__ == 'Point' and cc == (1, 2.5, True)")
+    interp.run_string("assert dd == (-3, 0.0, False)")
+    interp.close()
+
+
+def test_singlequeue_schema_must_have_plain_fields():
+    with pytest.raises(TypeError):
+        SingleQueue(schema=tuple)
+
+
+def test_singlequeue_sends_more_out_of_band_buffers_than_iov_max(lowlevel):
+    interp = Interpreter().start()
+    interp.run_string("import pickle")
+    aa = SingleQueue()
+    interp.run_string("import extrainterpreters; extrainterpreters.DEBUG = True")
+    interp.run_string(f"bb = pickle.loads({pickle.dumps(aa)})")
+    aa.put([pickle.PickleBuffer(bytearray(b"ab")) for _ in range(1500)], timeout=1)
+    interp.run_string("cc = bb.get()")
+    interp.run_string("assert [bytes(buffer) for buffer in cc] == [b'ab'] * 1500")
+    interp.close()
+
+
+def test_singlequeue_out_of_band_get_in_subinterpreter_exits_cleanly():
+    import subprocess, sys
+
+    code = D(
+        """
+        import pickle
+        import extrainterpreters
+        from extrainterpreters import Interpreter, SingleQueue
+        extrainterpreters.DEBUG = True
+        interp = Interpreter().start()
+        queue = SingleQueue()
+        interp.run_string("import pickle, extrainterpreters; extrainterpreters.DEBUG = True")
+        interp.run_string(f"queue = pickle.loads({pickle.dumps(queue)})")
+        queue.put(pickle.PickleBuffer(b"xyz"))
+        interp.run_string("assert bytes(queue.get()) == b'xyz'")
+        interp.close()
+        """
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_singlequeue_methods_of_the_other_side_raise():
+    aa = SingleQueue()
+    with pytest.raises(RuntimeError):
+        aa.get()
+    with pytest.raises(RuntimeError):
+        aa.task_done()
+    aa.put(1)
+    assert "get" not in aa.__getstate__()
+
+
+def test_singlequeue_is_freed_without_the_cyclic_gc():
+    aa = SingleQueue()
+    ref = weakref.ref(aa)
+    gc.disable()
+    try:
+        del aa
+        assert ref() is None
+    finally:
+        gc.enable()
+
+
+def test_singlequeue_put_waits_for_task_done_count():
+    aa = SingleQueue(maxsize=1)
+    aa.put(1)
+    start = time.monotonic()
+    with pytest.raises(Full):
+        aa.put(2, timeout=0.2)
+    assert 0.2 <= time.monotonic() - start < 1
+
+    # What the other end posts for each "task_done":
+    timer = threading.Timer(0.1, os.write, (aa.pipe.counterpart_fds[1], b"\x01"))
+    timer.start()
+    aa.put(3, timeout=2)
+    timer.join()
+    assert aa.size == 1
+
+
+def test_singlequeue_put_writes_without_polling(monkeypatch):
+    aa = SingleQueue()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("no polling needed while the pipe has room")
+
+    monkeypatch.setattr(aa.pipe, "select_for_write", fail)
+    aa.put(1)
+    aa.put(2, block=False)
+    assert aa.size == 2
+    monkeypatch.undo()
+    with pytest.raises(Full):
+        while True:
+            aa.put(b"\x00" * 100, block=False)
+
+
+def test_singlequeue_nonblocking_put_never_leaves_partial_frames(lowlevel):
+    interp = Interpreter().start()
+    interp.run_string("import pickle")
+    aa = SingleQueue()
+    interp.run_string("import extrainterpreters; extrainterpreters.DEBUG = True")
+    interp.run_string(f"bb = pickle.loads({pickle.dumps(aa)})")
+    # larger than the pipe capacity: can't be sent without blocking
+    with pytest.raises(Full):
+        aa.put_nowait(b"x" * 200_000)
+    aa.put(b"y" * 50_000)
+    with pytest.raises(Full):
+        aa.put(b"z" * 50_000, block=False)
+    aa.put(b"small", block=False)
+    interp.run_string("cc = bb.get(); dd = bb.get()")
+    interp.run_string("assert cc == b'y' * 50_000 and dd == b'small'")
+    interp.close()
+
+
+def test_singlequeue_task_done_counts_are_batched_while_items_remain(lowlevel):
+    interp = Interpreter().start()
+    interp.run_string("import pickle")
+    aa = SingleQueue()
+    interp.run_string("import extrainterpreters; extrainterpreters.DEBUG = True")
+    interp.run_string(f"bb = pickle.loads({pickle.dumps(aa)})")
+    aa.put(1)
+    aa.put(2)
+    aa.put(3)
+    interp.run_string("bb.get(); bb.task_done(); bb.get(); bb.task_done()")
+    # an item is left to get: counts are held back
+    assert aa.size == 3
+    interp.run_string("bb.get(); bb.task_done()")
+    # nothing left: the parent may be waiting for them
+    assert aa.size == 0
+    interp.close()
+
+
+def test_singlequeue_task_done_counts_are_posted_on_close(lowlevel):
+    interp = Interpreter().start()
+    interp.run_string("import pickle")
+    aa = SingleQueue()
+    interp.run_string("import extrainterpreters; extrainterpreters.DEBUG = True")
+    interp.run_string(f"bb = pickle.loads({pickle.dumps(aa)})")
+    aa.put(1)
+    aa.put(2)
+    interp.run_string("bb.get(); bb.task_done()")
+    assert aa.size == 2
+    interp.run_string("bb.close()")
+    assert aa.size == 1
+    interp.close()
+
+
+def test_singlequeue_join_waits_for_task_done(lowlevel):
+    interp = Interpreter().start()
+    interp.run_string("import pickle")
+    aa = SingleQueue(maxsize=1)
+    interp.run_string("import extrainterpreters; extrainterpreters.DEBUG = True")
+    interp.run_string(f"bb = pickle.loads({pickle.dumps(aa)})")
+    aa.put(1)
+    consumer = threading.Thread(
+        target=interp.run_string,
+        args=("import time; bb.get(); time.sleep(0.1); bb.task_done()",),
+    )
+    consumer.start()
+    aa.join()
+    assert aa.size == 0
+    aa.put(2, block=False)
+    consumer.join()
+    interp.close()
+
+
 def test_queue_send_object():
     q = Queue()
     q.put((1, 2))
     assert q.get((1, 2))
 
 
+@pytest.mark.parametrize("size", [None, 0, 1])
+def test_queue_local_buffer_does_not_drop_items(size):
+    q = Queue(size=size)
+    q.put(1)
+    q.put(2)
+    assert q.get() == 1
+    assert q.get() == 2
+
+
+def test_queue_get_claims_pending_signal_without_polling(monkeypatch):
+    q = Queue()
+    q.put(1)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("no polling needed while a signal is pending")
+
+    monkeypatch.setattr(q._signal_pipe, "select", fail)
+    assert q.get() == 1
+
+
+def test_queue_get_retries_signal_without_item_until_deadline():
+    q = Queue()
+    # the signal shows up before the item it announces:
+    q._signal_pipe.write(b"\x01")
+    timer = threading.Timer(0.1, q._buffer.new_item, (1,))
+    timer.start()
+    assert q.get(timeout=2) == 1
+    timer.join()
+    q._signal_pipe.write(b"\x01")
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        q.get(timeout=0.2)
+    assert 0.2 <= time.monotonic() - start < 1
+
+
 # gone are the private pipes inside queues.
 # def test_queue_can_build_private_pipe_once_active_on_subinterpreter(lowlevel):
 
@@ -1,4 +1,4 @@
-from extrainterpreters.utils import StructBase, Field, DoubleField
+from extrainterpreters.utils import StructBase, Field, DoubleField, RawField
 
 import pytest
 
@@ -94,3 +94,116 @@ def test_struct_doublefield():
     s = Struct(value=1.25)
     assert s._data == bytearray(b"\x00\x00\x00\x00\x00\x00\xf4?")
     assert s.value == 1.25
+
+
+def test_struct_padding_is_not_a_field():
+    class Struct(StructBase):
+        data_offset = Field(2)
+        _pad = RawField(6)
+
+    assert Struct._size == 8
+    assert list(Struct._fields) == ["data_offset"]
+    s = Struct(data_offset=1000)
+    assert s.data_offset == 1000
+
+
+def test_struct_values_read_and_written_at_once():
+    class Struct(StructBase):
+        data_offset = Field(2)
+        _pad = RawField(2)
+        length = Field(4)
+        ratio = DoubleField()
+
+    assert Struct._struct.size == Struct._size
+    s = Struct._from_data(bytearray(b"\x00" * 20), 4)
+    s._set_values(1000, 2_000_000, 0.5)
+    assert s.data_offset == 1000
+    assert s.length == 2_000_000
+    assert s._values == (1000, 2_000_000, 0.5)
+    assert s._values.length == 2_000_000
+
+
+def test_struct_read_values_from_memoryview():
+    class Struct(StructBase):
+        data_offset = Field(2)
+        length = Field(4)
+
+    data = bytearray(b"\x00" * 10)
+    Struct._from_data(data, 3)._set_values(1000, 2_000_000)
+    view = memoryview(data)
+    assert Struct._read_values(view, 3) == (1000, 2_000_000)
+    assert Struct._from_data(view, 3)._values.length == 2_000_000
+
+
+def test_struct_values_with_odd_sized_field():
+    class Struct(StructBase):
+        data_offset = Field(3)
+        length = Field(4)
+
+    assert Struct._struct is None
+    s = Struct._from_data(bytearray(b"\x00" * 7), 0)
+    s._set_values(1000, 2_000_000)
+    assert s._values == (1000, 2_000_000)
+
+
+def test_struct_field_accessors():
+    class Struct(StructBase):
+        flag = Field(1)
+        data_offset = Field(2)
+        ratio = DoubleField()
+        tag = RawField(3)
+
+    data = bytearray(b"\x00" * 20)
+    Struct._write_flag(data, 4, 7)
+    Struct._write_data_offset(data, 4, 1000)
+    Struct._write_ratio(data, 4, 0.25)
+    Struct._write_tag(data, 4, b"abc")
+    s = Struct._from_data(data, 4)
+    assert (s.flag, s.data_offset, s.ratio, s.tag) == (7, 1000, 0.25, b"abc")
+    assert Struct._read_flag(data, 4) == 7
+    assert Struct._read_data_offset(data, 4) == 1000
+    assert Struct._read_ratio(data, 4) == 0.25
+    assert Struct._read_tag(data, 4) == b"abc"
+
+
+def test_struct_out_of_range_values_raise_overflow_error():
+    class Struct(StructBase):
+        flag = Field(1)
+        length = Field(4)
+
+    s = Struct._from_data(bytearray(5))
+    with pytest.raises(OverflowError):
+        s.length = 2**32
+    with pytest.raises(OverflowError):
+        s.flag = -1
+    with pytest.raises(OverflowError):
+        s._set_values(1, 2**32)
+
+
+def test_struct_on_data_without_buffer_protocol():
+    class Data:
+        # Sliceable, like a RemoteArray, but exposes no buffer
+        def __init__(self, size):
+            self.data = bytearray(size)
+
+        def __getitem__(self, index):
+            return self.data[index]
+
+        def __setitem__(self, index, value):
+            self.data[index] = value
+
+    class Struct(StructBase):
+        data_offset = Field(2)
+        length = Field(4)
+
+    s = Struct._from_data(data := Data(10), 4)
+    assert not s._has_buffer
+    s.data_offset = 1000
+    s.length = 2_000_000
+    assert (s.data_offset, s.length) == (1000, 2_000_000)
+    assert s._values == (1000, 2_000_000)
+    s._detach()
+    assert s._has_buffer
+    assert s.length == 2_000_000
+    with pytest.raises(OverflowError):
+        Struct._from_data(data, 4).length = 2**32